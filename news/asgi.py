@@ -14,4 +14,22 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "news.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the apps are loaded by get_asgi_application().
+from news_app import counters  # noqa: E402 isort: skip
+from news_app.events import EVENTS_PATH, news_events  # noqa: E402 isort: skip
+
+
+counters.start()
+
+
+async def application(scope: dict, receive, send) -> None:
+    """
+    Streams newly published news as Server-Sent Events under ``EVENTS_PATH`` and hands
+    every other request to Django.
+    """
+    if scope["type"] == "http" and scope["path"] == EVENTS_PATH:
+        await news_events(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -15,14 +15,13 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 
-# configuring dotenv for pythonanywhere to be changed
-project_folder = os.path.expanduser("~/news-task")
-load_dotenv(os.path.join(project_folder, ".env"))
-# for local
-load_dotenv()
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# The .env file lives in the project root, locally as on pythonanywhere (~/news-task).
+# Loading it by path skips the directory search of a bare load_dotenv() call.
+load_dotenv(BASE_DIR / ".env")
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.1/howto/deployment/checklist/
@@ -88,10 +87,78 @@ WSGI_APPLICATION = "news.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+    }
+}
+
+# Production SQLite mode, on by default when DEBUG is off. WAL journaling lets readers
+# proceed while a write is in progress and the busy timeout makes writers wait for the
+# lock instead of failing with "database is locked", which the news.sqlite backend
+# makes possible by locking when transactions begin. The backend applies the pragmas
+# to every new connection. Connections are kept for CONN_MAX_AGE by long-lived threads
+# only: the serve command handles each client connection on a new thread, so its
+# database connections are closed when the client disconnects.
+SQLITE_PRODUCTION_MODE = (
+    os.environ.get("SQLITE_PRODUCTION_MODE", str(not DEBUG)) == "True"
+)
+if SQLITE_PRODUCTION_MODE:
+    DATABASES["default"].update(
+        {
+            "ENGINE": "news.sqlite",
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "timeout": 20,
+                "pragmas": {
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "busy_timeout": 20000,
+                    "mmap_size": 256 * 1024 * 1024,
+                    "cache_size": -64 * 1024,
+                    "temp_store": "MEMORY",
+                },
+            },
+        }
+    )
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# A file based cache is shared by the web and task worker processes, so pages warmed
+# by the worker are served by every web process.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_DIR", BASE_DIR / "cache"),
     }
 }
 
+# Seconds a rendered listing or detail page is served from the cache, 0 disables it.
+NEWS_PAGE_CACHE_TIMEOUT = 0 if DEBUG else 15 * 60
+# Number of listing pages re-rendered for the home page and each category on publish.
+NEWS_WARM_PAGES = 3
+# Seconds news reads are buffered in memory before they are written to the database.
+NEWS_VIEW_FLUSH_INTERVAL = 30
+# Number of articles in each most read list.
+NEWS_MOST_READ_LIMIT = 5
+# Number of related articles stored for each news article.
+NEWS_RELATED_LIMIT = 5
+# Age in days after which an article counts half as related as a new one.
+NEWS_RELATED_HALF_LIFE_DAYS = 30
+# Number of news and of category slugs each process keeps mapped to primary keys.
+NEWS_SLUG_CACHE_SIZE = 1024
+# Age in days after which the archive_news command moves news into the archive.
+NEWS_ARCHIVE_AFTER_DAYS = int(os.environ.get("NEWS_ARCHIVE_AFTER_DAYS", 180))
+# Seconds each process reuses the categories of the navigation before reloading them.
+NEWS_CATEGORY_NAV_TIMEOUT = 60
+# Number of published news each process keeps for Server-Sent Events clients to resume.
+NEWS_EVENTS_HISTORY = 1000
+# Seconds between the keep-alive comments sent to idle Server-Sent Events clients.
+NEWS_EVENTS_KEEPALIVE = 15
+# Seconds between the checks for news published by other processes.
+NEWS_EVENTS_POLL_INTERVAL = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -129,6 +196,12 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
+# In production collectstatic writes content hashed files with gzip and brotli variants,
+# which news.staticfiles.serve hands out with far-future cache headers.
+if not DEBUG:
+    STATICFILES_STORAGE = "news.staticfiles.CompressedManifestStaticFilesStorage"
+# Tests run with the static files and cache settings of development, see the runner.
+TEST_RUNNER = "news.test_runner.NewsTestRunner"
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The SQLite backend, applying pragmas to its connections and starting transactions
+    with ``BEGIN IMMEDIATE``.
+
+    The ``pragmas`` option maps pragma names to the values set on every new connection.
+
+    A deferred transaction takes the write lock on its first write. When it has read
+    before and another connection wrote in between, SQLite fails it at once with
+    "database is locked", however long the busy timeout. Taking the lock when the
+    transaction begins makes concurrent writers wait for each other instead. Reads
+    outside transactions are not affected and, with WAL journaling, never wait.
+    """
+
+    def get_connection_params(self) -> dict:
+        params = super().get_connection_params()
+        params.pop("pragmas", None)
+        return params
+
+    def get_new_connection(self, conn_params: dict) -> sqlite3.Connection:
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict["OPTIONS"].get("pragmas", {}).items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _start_transaction_under_autocommit(self) -> None:
+        self.cursor().execute("BEGIN IMMEDIATE")
@@ -0,0 +1,192 @@
+"""
+Static files with content hashed names, precompressed variants and far-future caching.
+
+``CompressedManifestStaticFilesStorage`` writes a gzip and, when the optional
+``brotli`` package is installed, a brotli variant next to every hashed file at
+``collectstatic`` time. ``serve`` answers requests under ``STATIC_URL`` with the
+smallest variant the client accepts.
+"""
+
+import os
+import gzip
+import mimetypes
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpRequest, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+# Extensions of text based files worth compressing.
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".json", ".map", ".svg", ".txt", ".xml"}
+# Encodings in order of preference with the suffix of their precompressed files.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Cache lifetime of hashed files, which never change under the same name.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# Cache lifetime of files served under their original name.
+MUTABLE_MAX_AGE = 60 * 60
+
+
+def compress_file(path: str) -> list[str]:
+    """
+    Writes the gzip and brotli variants of a file, keeping only those that are smaller.
+
+    Parameters:
+    -----------
+    path : str
+        The path of the file to compress.
+
+    Returns:
+    --------
+    paths : list[str]
+        The paths of the variants that were written.
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(content):
+            with open(path + suffix, "wb") as file:
+                file.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    A manifest storage that also writes precompressed variants of the hashed files.
+
+    Methods:
+    --------
+    post_process(paths, dry_run=False, **options)
+        Hashes the collected files, then compresses the hashed text files.
+    """
+
+    def post_process(self, paths: dict, dry_run: bool = False, **options):
+        """
+        Hashes the collected files, then compresses the hashed text files.
+
+        Parameters:
+        -----------
+        paths : dict
+            The collected files, as passed by ``collectstatic``.
+        dry_run : bool
+            Whether files should only be listed rather than written.
+
+        Yields:
+        -------
+        result : tuple
+            (original name, processed name, processed) tuples.
+        """
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            if os.path.splitext(hashed_name)[1] in COMPRESSIBLE_EXTENSIONS:
+                compress_file(self.path(hashed_name))
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """
+    Returns the content codings an Accept-Encoding header allows.
+
+    Parameters:
+    -----------
+    header : str
+        The value of the Accept-Encoding header.
+
+    Returns:
+    --------
+    encodings : set[str]
+        The lower cased codings, without those refused with q=0.
+    """
+    encodings = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        match = re.search(r"q\s*=\s*([\d.]+)", params)
+        if coding and not (match and float(match.group(1)) == 0):
+            encodings.add(coding.strip())
+    return encodings
+
+
+@lru_cache(maxsize=None)
+def hashed_names() -> frozenset:
+    """
+    Returns the hashed names listed in the staticfiles manifest.
+    """
+    return frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+
+def serve(request: HttpRequest, path: str) -> FileResponse:
+    """
+    Serves a collected static file, preferring a precompressed variant.
+
+    Hashed files are cached by clients for a year, other files for an hour.
+
+    Parameters:
+    -----------
+    request : HttpRequest
+        The current request.
+    path : str
+        The path of the file below ``STATIC_ROOT``.
+
+    Returns:
+    --------
+    response : FileResponse
+        The file response.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid static file path")
+    if not os.path.isfile(full_path):
+        raise Http404(f"{path} not found")
+
+    stat = os.stat(full_path)
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime
+    ):
+        return HttpResponseNotModified()
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    encoding, served_path = None, full_path
+    if os.path.splitext(full_path)[1] in COMPRESSIBLE_EXTENSIONS:
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(full_path + suffix):
+                encoding, served_path = candidate, full_path + suffix
+                break
+
+    response = FileResponse(open(served_path, "rb"), content_type=content_type)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Vary"] = "Accept-Encoding"
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    if path in hashed_names():
+        response["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={MUTABLE_MAX_AGE}"
+    return response
@@ -0,0 +1,29 @@
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class NewsTestRunner(DiscoverRunner):
+    """
+    A test runner using the static files and cache settings of development, whatever
+    the ``DEPLOYMENT_MODE``.
+
+    Without DEBUG the manifest storage refuses to resolve files missing from the
+    manifest written by ``collectstatic``, so every ``{% static %}`` tag would fail, and
+    pages would be cached in the shared cache directory across tests. Tests of the page
+    cache enable it themselves.
+    """
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        self.development_settings = override_settings(
+            STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            },
+            NEWS_PAGE_CACHE_TIMEOUT=0,
+        )
+        self.development_settings.enable()
+
+    def teardown_test_environment(self, **kwargs) -> None:
+        self.development_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -13,8 +13,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from .staticfiles import serve
 
 
 urlpatterns = [path("admin/", admin.site.urls), path("", include("news_app.urls"))]
+
+# In development the staticfiles app serves files from the app directories instead.
+if not settings.DEBUG:
+    urlpatterns.insert(
+        0, re_path(rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.*)$", serve)
+    )
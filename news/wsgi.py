@@ -15,3 +15,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "news.settings")
 
 application = get_wsgi_application()
+
+# Imported once the apps are loaded by get_wsgi_application().
+from news_app import counters  # noqa: E402 isort: skip
+
+
+counters.start()
@@ -42,7 +42,7 @@ class NewsAdmin(admin.ModelAdmin):
         A tuple containing the names of fields to use as filters in the changelist view.
     """
 
-    list_display: tuple = ("title", "main_category", "created_at")
+    list_display: tuple = ("title", "main_category", "created_at", "views")
     prepopulated_fields: dict = {"slug": ("title",)}
     ordering: tuple = ("created_at",)
     search_fields: tuple = ("title",)
@@ -51,3 +51,55 @@ class NewsAdmin(admin.ModelAdmin):
         "add_category",
         "created_at",
     )
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """
+    Admin class for the Task model.
+
+    Attributes:
+    -----------
+    list_display : tuple
+        A tuple containing the names of fields to display in the changelist view.
+    list_filter : tuple
+        A tuple containing the names of fields to use as filters in the changelist view.
+    readonly_fields : tuple
+        A tuple containing the names of fields that cannot be edited.
+    """
+
+    list_display: tuple = ("name", "payload", "status", "attempts", "run_after")
+    list_filter: tuple = ("status", "name")
+    readonly_fields: tuple = ("dedupe_key", "created_at", "updated_at")
+
+
+@admin.register(ArchivedNews)
+class ArchivedNewsAdmin(admin.ModelAdmin):
+    """
+    Admin class for the ArchivedNews model.
+
+    Archived news are read only, they are written by the ``archive_news`` command and
+    counted in the partition catalog.
+
+    Attributes:
+    -----------
+    list_display : tuple
+        A tuple containing the names of fields to display in the changelist view.
+    search_fields : tuple
+        A tuple containing the names of fields to search for in the admin interface.
+    list_filter : tuple
+        A tuple containing the names of fields to use as filters in the changelist view.
+    """
+
+    list_display: tuple = ("title", "main_category", "created_at", "period", "views")
+    search_fields: tuple = ("title",)
+    list_filter: tuple = ("period", "main_category")
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,276 @@
+import datetime
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from .models import ArchivedNews, ArchivePeriod, News, RelatedNews
+from .tasks import enqueue
+
+
+__all__ = (
+    "period_of",
+    "archive_news",
+    "refresh_periods",
+    "partitions",
+    "ArchiveChain",
+)
+
+# Format of the archive partitions, one per month.
+PERIOD_FORMAT = "%Y-%m"
+
+logger = logging.getLogger(__name__)
+
+
+def period_of(moment: datetime.datetime) -> str:
+    """
+    Returns the archive partition of a creation time, the UTC month as "YYYY-MM".
+    """
+    return moment.astimezone(datetime.timezone.utc).strftime(PERIOD_FORMAT)
+
+
+def release_archived(batch: list) -> None:
+    """
+    Renames the archived news whose slug or title is taken by news about to be archived.
+
+    Only news saved before slugs and titles were checked against the archive can
+    collide. The news table answered their URL until now, so the news being archived
+    keep it and the older archived ones get their primary key appended.
+
+    Parameters:
+    -----------
+    batch : list
+        The news about to be archived.
+    """
+    slugs = {news.slug for news in batch}
+    titles = {news.title for news in batch}
+    slug_length = ArchivedNews._meta.get_field("slug").max_length
+    title_length = ArchivedNews._meta.get_field("title").max_length
+    for archived in ArchivedNews.objects.filter(
+        Q(slug__in=slugs) | Q(title__in=titles)
+    ):
+        logger.warning(
+            "Archived news %s clashes with news being archived, renaming it",
+            archived.pk,
+        )
+        if archived.slug in slugs:
+            suffix = f"-{archived.pk}"
+            archived.slug = archived.slug[: slug_length - len(suffix)] + suffix
+        if archived.title in titles:
+            suffix = f" ({archived.pk})"
+            archived.title = archived.title[: title_length - len(suffix)] + suffix
+        archived.save(update_fields=["slug", "title"])
+
+
+def archive_news(before: datetime.datetime, batch_size: int = 500) -> int:
+    """
+    Moves the news created before a datetime from the news table into the archive.
+
+    Each batch is copied, deleted from the news table and counted in the partition
+    catalog in one transaction. Deleting sends the usual signals, so slugs and cached
+    detail pages are evicted and the category listings re-rendered; news whose related
+    articles were archived get new ones. Archived news clashing with the news being
+    archived are renamed by ``release_archived`` rather than failing every run.
+
+    Parameters:
+    -----------
+    before : datetime
+        The creation time before which news are archived.
+    batch_size : int
+        The number of news moved per transaction.
+
+    Returns:
+    --------
+    count : int
+        The number of archived news.
+    """
+    through = ArchivedNews.add_category.through
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                News.objects.filter(created_at__lt=before)
+                .order_by("created_at")
+                .prefetch_related("add_category")[:batch_size]
+            )
+            if not batch:
+                break
+            ids = [news.pk for news in batch]
+            release_archived(batch)
+            ArchivedNews.objects.bulk_create(
+                [
+                    ArchivedNews(
+                        id=news.pk,
+                        title=news.title,
+                        slug=news.slug,
+                        text=news.text,
+                        rendered_text=news.body_html,
+                        main_category_id=news.main_category_id,
+                        created_at=news.created_at,
+                        views=news.views,
+                        period=period_of(news.created_at),
+                    )
+                    for news in batch
+                ]
+            )
+            through.objects.bulk_create(
+                [
+                    through(archivednews_id=news.pk, category_id=category.pk)
+                    for news in batch
+                    for category in news.add_category.all()
+                ]
+            )
+            orphaned = set(
+                RelatedNews.objects.filter(related__in=ids)
+                .exclude(news__in=ids)
+                .values_list("news_id", flat=True)
+            )
+            News.objects.filter(pk__in=ids).delete()
+            refresh_periods({period_of(news.created_at) for news in batch})
+
+            def queue(orphaned: set = orphaned) -> None:
+                for news_id in sorted(orphaned):
+                    enqueue("news_changed", news_id)
+
+            transaction.on_commit(queue)
+        archived += len(batch)
+    return archived
+
+
+def refresh_periods(periods: set) -> None:
+    """
+    Recounts the given partitions of the archive in the partition catalog.
+
+    Parameters:
+    -----------
+    periods : set
+        The partitions to recount, as "YYYY-MM".
+    """
+    through = ArchivedNews.add_category.through
+    categories = defaultdict(set)
+    for news_id, category_id in through.objects.filter(
+        archivednews__period__in=periods
+    ).values_list("archivednews_id", "category_id"):
+        categories[news_id].add(category_id)
+
+    stats = {}
+    for news_id, period, created_at, main_category_id in ArchivedNews.objects.filter(
+        period__in=periods
+    ).values_list("pk", "period", "created_at", "main_category_id"):
+        for category_id in {None, main_category_id, *categories[news_id]}:
+            count, oldest, newest = stats.get(
+                (period, category_id), (0, created_at, created_at)
+            )
+            stats[period, category_id] = (
+                count + 1,
+                min(oldest, created_at),
+                max(newest, created_at),
+            )
+
+    with transaction.atomic():
+        ArchivePeriod.objects.filter(period__in=periods).delete()
+        ArchivePeriod.objects.bulk_create(
+            [
+                ArchivePeriod(
+                    period=period,
+                    category_id=category_id,
+                    count=count,
+                    oldest=oldest,
+                    newest=newest,
+                )
+                for (period, category_id), (count, oldest, newest) in stats.items()
+            ]
+        )
+
+
+def partitions(
+    category_id: int | None = None,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+) -> list[tuple[str, int]]:
+    """
+    Returns the archive partitions holding news of a category and date range.
+
+    Only the partition catalog is read, never the archive itself.
+
+    Parameters:
+    -----------
+    category_id : int | None
+        The category of the news, or None for all news.
+    start : datetime | None
+        The start of the date range, or None.
+    end : datetime | None
+        The end of the date range, or None.
+
+    Returns:
+    --------
+    partitions : list[tuple[str, int]]
+        (period, number of news) tuples, newest first.
+    """
+    queryset = ArchivePeriod.objects.filter(category_id=category_id)
+    if start is not None:
+        queryset = queryset.filter(newest__gte=start)
+    if end is not None:
+        queryset = queryset.filter(oldest__lte=end)
+    return list(queryset.order_by("-period").values_list("period", "count"))
+
+
+class ArchiveChain:
+    """
+    A sequence of the news of the news table followed by those of the archive, sliced
+    by the paginator like a queryset.
+
+    Archived news are older than every news in the news table, so the sequence keeps
+    the newest-first order of both querysets. The archive is only queried for slices
+    reaching past the news table and, unless its count is given, to count the pages.
+
+    Attributes:
+    -----------
+    hot : QuerySet
+        The news of the news table.
+    archived : QuerySet
+        The news of the archive.
+    archived_count : int | None
+        The number of archived news, counted on demand when None.
+
+    Methods:
+    --------
+    count()
+        Returns the total number of news.
+    """
+
+    ordered = True
+
+    def __init__(
+        self, hot: QuerySet, archived: QuerySet, archived_count: int | None = None
+    ) -> None:
+        self.hot = hot
+        self.archived = archived
+        self.archived_count = archived_count
+
+    @cached_property
+    def hot_count(self) -> int:
+        return self.hot.count()
+
+    def count(self) -> int:
+        """
+        Returns the total number of news.
+        """
+        if self.archived_count is None:
+            self.archived_count = self.archived.count()
+        return self.hot_count + self.archived_count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, index: slice) -> list:
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        items = list(self.hot[start:stop]) if start < self.hot_count else []
+        if stop > self.hot_count:
+            items += self.archived[
+                max(start - self.hot_count, 0) : stop - self.hot_count
+            ]
+        return items
@@ -1,5 +1,49 @@
+import threading
+import time
+
+from django.conf import settings
+
 from .models import Category
 
 
+# The categories of the navigation and the time they were loaded at.
+_nav = {"categories": None, "loaded_at": 0.0}
+_lock = threading.Lock()
+
+
+def category_nav() -> list:
+    """
+    Returns the categories shown in the navigation of every page.
+
+    The list is kept in process memory, reloaded after ``NEWS_CATEGORY_NAV_TIMEOUT``
+    seconds and cleared by the category signals of this process.
+
+    Returns:
+    --------
+    categories : list
+        The categories.
+    """
+    with _lock:
+        categories = _nav["categories"]
+        fresh = (
+            time.monotonic() - _nav["loaded_at"] < settings.NEWS_CATEGORY_NAV_TIMEOUT
+        )
+    if categories is not None and fresh:
+        return categories
+    categories = list(Category.objects.all())
+    with _lock:
+        _nav["categories"] = categories
+        _nav["loaded_at"] = time.monotonic()
+    return categories
+
+
+def clear_category_nav() -> None:
+    """
+    Drops the categories of the navigation, so the next page reloads them.
+    """
+    with _lock:
+        _nav["categories"] = None
+
+
 def get_categories(request):
-    return {"categories": Category.objects.all()}
+    return {"categories": category_nav()}
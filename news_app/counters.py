@@ -0,0 +1,201 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Category, News, NewsViews
+
+
+__all__ = ("record_view", "start", "flush", "refresh_most_read", "most_read")
+
+logger = logging.getLogger(__name__)
+
+# Number of calendar days covered by each most read period, counting today. Reads are
+# counted per day, so "today" starts at midnight rather than 24 hours ago.
+PERIODS = {"today": 1, "week": 7}
+
+# Reads counted in this process and not yet written, keyed by news slug.
+pending: Counter = Counter()
+lock = threading.Lock()
+# The thread of this process writing the buffered reads, once started.
+flusher: threading.Thread | None = None
+
+
+def record_view(slug: str) -> None:
+    """
+    Counts a read of a news article in memory, to be written by the flush thread.
+
+    Parameters:
+    -----------
+    slug : str
+        The slug of the news article that was read.
+    """
+    with lock:
+        pending[slug] += 1
+
+
+def start() -> threading.Thread:
+    """
+    Starts the thread writing the buffered reads every ``NEWS_VIEW_FLUSH_INTERVAL``
+    seconds, unless this process already runs it.
+
+    Reads are written whether or not requests keep coming, and never by the request
+    that happens to cross the interval. The reads still buffered when the process exits
+    are written too, so this is meant for serving processes only: others, like the test
+    runner, may have no database left at exit.
+
+    Returns:
+    --------
+    thread : Thread
+        The flush thread.
+    """
+    global flusher
+
+    with lock:
+        if flusher is None or not flusher.is_alive():
+            flusher = threading.Thread(
+                target=flush_periodically, name="news-views-flush", daemon=True
+            )
+            flusher.start()
+            atexit.register(flush)
+        return flusher
+
+
+def flush_periodically() -> None:
+    """
+    Flushes the buffered reads every ``NEWS_VIEW_FLUSH_INTERVAL`` seconds, forever.
+    """
+    while True:
+        time.sleep(settings.NEWS_VIEW_FLUSH_INTERVAL)
+        close_old_connections()
+        try:
+            flush()
+        except Exception:
+            logger.exception("Could not write the buffered news reads")
+
+
+def flush() -> int:
+    """
+    Writes the buffered reads to the database and refreshes the most read lists.
+
+    Articles read the same number of times are incremented with a single ``UPDATE``.
+    If the writes fail, e.g. with "database is locked", the reads are put back in the
+    buffer.
+
+    Returns:
+    --------
+    count : int
+        The number of reads that were written.
+    """
+    with lock:
+        counts = dict(pending)
+        pending.clear()
+    if not counts:
+        return 0
+
+    try:
+        ids = dict(News.objects.filter(slug__in=counts).values_list("slug", "pk"))
+        by_count = defaultdict(list)
+        for slug, pk in ids.items():
+            by_count[counts[slug]].append(pk)
+
+        today = timezone.localdate()
+        with transaction.atomic():
+            NewsViews.objects.bulk_create(
+                [NewsViews(news_id=pk, date=today) for pk in ids.values()],
+                ignore_conflicts=True,
+            )
+            for count, pks in by_count.items():
+                News.objects.filter(pk__in=pks).update(views=F("views") + count)
+                NewsViews.objects.filter(news_id__in=pks, date=today).update(
+                    count=F("count") + count
+                )
+    except Exception:
+        # The reads are kept for the next flush rather than lost.
+        with lock:
+            pending.update(counts)
+        raise
+    refresh_most_read()
+    return sum(counts[slug] for slug in ids)
+
+
+def refresh_most_read(limit: int | None = None) -> None:
+    """
+    Recomputes the most read lists of every period, overall and per category.
+
+    Only the daily counts of the period are aggregated, so the cost depends on the
+    number of articles read recently rather than on the size of the news table.
+
+    Parameters:
+    -----------
+    limit : int | None
+        The length of each list, defaults to the ``NEWS_MOST_READ_LIMIT`` setting.
+    """
+    if limit is None:
+        limit = settings.NEWS_MOST_READ_LIMIT
+    today = timezone.localdate()
+    for period, days in PERIODS.items():
+        totals = dict(
+            NewsViews.objects.filter(date__gt=today - timezone.timedelta(days=days))
+            .values("news_id")
+            .annotate(total=Sum("count"))
+            .values_list("news_id", "total")
+        )
+        ranked = sorted(totals, key=lambda pk: (-totals[pk], -pk))
+        news = News.objects.select_related("main_category").prefetch_related(
+            "add_category"
+        )
+        lists = defaultdict(list)
+        by_pk = news.in_bulk(ranked)
+        for pk in ranked:
+            # Deleted or archived since its reads were aggregated.
+            item = by_pk.get(pk)
+            if item is None:
+                continue
+            entry = {
+                "title": item.title,
+                "url": item.get_absolute_url(),
+                "views": totals[pk],
+            }
+            slugs = {item.main_category.slug}
+            slugs.update(category.slug for category in item.add_category.all())
+            for key in (None, *slugs):
+                if len(lists[key]) < limit:
+                    lists[key].append(entry)
+        keys = [None, *Category.objects.values_list("slug", flat=True)]
+        cache.set_many(
+            {most_read_key(period, key): lists.get(key, []) for key in keys}, None
+        )
+
+
+def most_read(period: str, category_slug: str | None = None) -> list[dict]:
+    """
+    Returns the precomputed most read list of a period.
+
+    Parameters:
+    -----------
+    period : str
+        Either "today" or "week".
+    category_slug : str | None
+        The slug of a category, or None for the list over all news.
+
+    Returns:
+    --------
+    entries : list[dict]
+        Dicts with the title, url and number of views of each article.
+    """
+    return cache.get(most_read_key(period, category_slug), [])
+
+
+def most_read_key(period: str, category_slug: str | None) -> str:
+    """
+    Returns the cache key of a most read list.
+    """
+    return f"most_read:{period}:{category_slug or ''}"
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+
+from .models import News
+from .pubsub import Broker
+
+
+__all__ = ("EVENTS_PATH", "broker", "publish_news", "events_after", "news_events")
+
+logger = logging.getLogger(__name__)
+
+# Path of the Server-Sent Events stream of newly published news.
+EVENTS_PATH = "/events/news/"
+# Maximum number of missed news replayed to a client resuming from an old event id.
+BACKFILL_LIMIT = 100
+# Milliseconds browsers wait before reconnecting a dropped stream.
+RETRY_MS = 5000
+
+broker = Broker(settings.NEWS_EVENTS_HISTORY)
+
+
+def news_event(news: News) -> dict:
+    """
+    Returns the event published for a news article.
+
+    Parameters:
+    -----------
+    news : News
+        The news article, with its categories prefetched.
+
+    Returns:
+    --------
+    event : dict
+        The id, title, URL, category slugs and creation time of the news article.
+    """
+    return {
+        "id": news.pk,
+        "title": news.title,
+        "slug": news.slug,
+        "url": news.get_absolute_url(),
+        "categories": [
+            news.main_category.slug,
+            *(category.slug for category in news.add_category.all()),
+        ],
+        "created_at": news.created_at.isoformat(),
+    }
+
+
+def events_after(last_id: int, limit: int = BACKFILL_LIMIT) -> list[dict]:
+    """
+    Returns the events of the most recent news newer than an event id, oldest first.
+
+    Parameters:
+    -----------
+    last_id : int
+        The id of the last event a client has seen.
+    limit : int
+        The maximum number of events.
+
+    Returns:
+    --------
+    events : list[dict]
+        The events.
+    """
+    queryset = (
+        News.objects.filter(pk__gt=last_id)
+        .select_related("main_category")
+        .prefetch_related("add_category")
+        .order_by("-pk")[:limit]
+    )
+    return [news_event(news) for news in reversed(queryset)]
+
+
+def publish_news() -> None:
+    """
+    Publishes the news committed since the last event to the Server-Sent Events clients
+    of this process, once a news article was created here.
+
+    Publishing everything newer than the last event, rather than the created article
+    alone, keeps events in primary key order: news committed just before by another
+    process, which the poller has not seen yet, would otherwise be skipped for good.
+    SQLite allocates primary keys under the write lock, so news are committed in
+    primary key order. Processes without connected clients skip the query.
+    """
+    if broker.loop is None:
+        return
+    for event in events_after(broker.last_id):
+        broker.publish(event)
+
+
+async def start() -> None:
+    """
+    Binds the broker to the running event loop and starts polling for news published
+    by other processes, once per loop.
+    """
+    if broker.bind():
+        latest = await sync_to_async(latest_id)()
+        broker.last_id = max(broker.last_id, latest)
+        asyncio.get_running_loop().create_task(poll())
+
+
+def latest_id() -> int:
+    """
+    Returns the primary key of the newest news article, or 0.
+    """
+    return News.objects.aggregate(latest=Max("pk"))["latest"] or 0
+
+
+async def poll() -> None:
+    """
+    Publishes the news saved by other processes, whose signals cannot reach this broker.
+    """
+    while True:
+        await asyncio.sleep(settings.NEWS_EVENTS_POLL_INTERVAL)
+        try:
+            events = await sync_to_async(events_after)(broker.last_id)
+        except Exception:
+            logger.exception("Polling for published news failed")
+            continue
+        for event in events:
+            broker.publish(event)
+
+
+def encode_event(event: dict) -> bytes:
+    """
+    Returns an event in the Server-Sent Events wire format.
+    """
+    return f"id: {event['id']}\nevent: news\ndata: {json.dumps(event)}\n\n".encode()
+
+
+async def wait_disconnect(receive) -> None:
+    """
+    Waits until the client disconnects.
+    """
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def news_events(scope: dict, receive, send) -> None:
+    """
+    An ASGI application streaming newly published news as Server-Sent Events.
+
+    The ``category`` query parameter limits the stream to the news of one category.
+    Clients reconnecting with a ``Last-Event-ID`` header, or a ``last_event_id`` query
+    parameter, first receive the news they missed. Idle streams get a comment every
+    ``NEWS_EVENTS_KEEPALIVE`` seconds so proxies keep them open.
+
+    Parameters:
+    -----------
+    scope : dict
+        The ASGI connection scope.
+    receive : callable
+        The ASGI receive callable.
+    send : callable
+        The ASGI send callable.
+    """
+    if scope["method"] not in ("GET", "HEAD"):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 405,
+                "headers": [(b"allow", b"GET, HEAD")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    category = query.get("category", [""])[0]
+    headers = dict(scope.get("headers", []))
+    last_event_id = headers.get(b"last-event-id", b"").decode("latin-1").strip()
+    last_event_id = last_event_id or query.get("last_event_id", [""])[0]
+
+    await start()
+    backlog = []
+    if last_event_id.isdigit():
+        cursor = int(last_event_id)
+        if broker.history and broker.history[0]["id"] <= cursor:
+            backlog = broker.since(cursor)
+        else:
+            backlog = await sync_to_async(events_after)(cursor)
+    else:
+        cursor = broker.last_id
+
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        }
+    )
+    if scope["method"] == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+        return
+    await send(
+        {
+            "type": "http.response.body",
+            "body": f"retry: {RETRY_MS}\n\n".encode(),
+            "more_body": True,
+        }
+    )
+
+    disconnected = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        events = backlog
+        while True:
+            for event in events:
+                cursor = max(cursor, event["id"])
+                if not category or category in event["categories"]:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": encode_event(event),
+                            "more_body": True,
+                        }
+                    )
+            waiter = asyncio.ensure_future(
+                broker.wait(cursor, settings.NEWS_EVENTS_KEEPALIVE)
+            )
+            await asyncio.wait(
+                {waiter, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected.done():
+                waiter.cancel()
+                break
+            events = waiter.result()
+            if not events:
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": b": keep-alive\n\n",
+                        "more_body": True,
+                    }
+                )
+    finally:
+        disconnected.cancel()
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from news_app.archive import archive_news
+
+
+class Command(BaseCommand):
+    """
+    Moves old news articles from the news table into the archive.
+
+    Meant to run periodically, e.g. daily from cron, so the news table and its indexes
+    only hold the recent articles almost all traffic asks for.
+    """
+
+    help = "Archives the news articles older than the given number of days."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.NEWS_ARCHIVE_AFTER_DAYS,
+            help="Age in days after which news are archived.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Articles moved per batch."
+        )
+
+    def handle(self, *args, **options) -> None:
+        before = timezone.now() - timezone.timedelta(days=options["days"])
+        count = archive_news(before, options["batch_size"])
+        self.stdout.write(f"Archived {count} news.")
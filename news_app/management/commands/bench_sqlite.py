@@ -0,0 +1,210 @@
+import os
+import sys
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from news_app.models import Category, News
+from news_app.views import IndexView, NewsDetailView
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks concurrent reads and writes against the default and production SQLite modes.
+
+    For every mode a scratch database is created with ``migrate`` (which seeds 200 news),
+    then ``--processes`` worker processes render ``IndexView`` and ``NewsDetailView`` and
+    edit ``News`` rows for ``--duration`` seconds. Edits are saved like the admin saves
+    them: the row and its additional categories in one transaction, whose commit queues
+    the follow-up tasks. The command reports the throughput, the read latency under
+    that write load and the number of "database is locked" errors of each mode.
+    """
+
+    help = (
+        "Compares SQLite read/write throughput and lock errors across database modes."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--processes", type=int, default=4, help="Number of worker processes."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds each mode runs."
+        )
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Share of operations that save a News row.",
+        )
+        parser.add_argument(
+            "--modes",
+            default="default,production",
+            help="Comma separated database modes to compare.",
+        )
+        parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+        parser.add_argument("--start", type=float, help=argparse.SUPPRESS)
+        parser.add_argument("--until", type=float, help=argparse.SUPPRESS)
+        parser.add_argument("--seed", type=int, default=0, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options) -> None:
+        if options["worker"]:
+            result = run_worker(
+                options["start"],
+                options["until"],
+                options["write_ratio"],
+                options["seed"],
+            )
+            self.stdout.write(json.dumps(result))
+            return
+
+        self.stdout.write(
+            f"{'mode':<12}{'reads/s':>10}{'writes/s':>10}{'read p50':>10}"
+            f"{'read p95':>10}{'locked':>8}{'errors':>8}"
+        )
+        for mode in options["modes"].split(","):
+            totals = self.run_mode(mode, options)
+            duration = options["duration"]
+            latencies = sorted(totals["latencies"]) or [0.0]
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000
+            self.stdout.write(
+                f"{mode:<12}{totals['reads'] / duration:>10.1f}"
+                f"{totals['writes'] / duration:>10.1f}"
+                f"{p50:>8.1f}ms{p95:>8.1f}ms"
+                f"{totals['locked']:>8}{totals['errors']:>8}"
+            )
+
+    def run_mode(self, mode: str, options: dict) -> dict:
+        """
+        Runs the workers of one database mode against a scratch database.
+
+        Parameters:
+        -----------
+        mode : str
+            Either "default" or "production".
+        options : dict
+            The command options.
+
+        Returns:
+        --------
+        totals : dict
+            The summed read, write, locked and error counts of all workers, and the
+            latencies of all their reads.
+        """
+        directory = tempfile.mkdtemp(prefix="bench_sqlite_")
+        env = {
+            **os.environ,
+            "SQLITE_PATH": os.path.join(directory, "db.sqlite3"),
+            "SQLITE_PRODUCTION_MODE": str(mode == "production"),
+            "CACHE_DIR": os.path.join(directory, "cache"),
+        }
+        manage = [sys.executable, os.path.join(settings.BASE_DIR, "manage.py")]
+        try:
+            subprocess.run(manage + ["migrate", "-v0"], env=env, check=True)
+            # Give every worker time to start up so they all begin together.
+            start = time.time() + 3
+            until = start + options["duration"]
+            workers = [
+                subprocess.Popen(
+                    manage
+                    + [
+                        "bench_sqlite",
+                        "--worker",
+                        f"--start={start}",
+                        f"--until={until}",
+                        f"--write-ratio={options['write_ratio']}",
+                        f"--seed={seed}",
+                    ],
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+                for seed in range(options["processes"])
+            ]
+            totals = {
+                "reads": 0,
+                "writes": 0,
+                "locked": 0,
+                "errors": 0,
+                "latencies": [],
+            }
+            for worker in workers:
+                output, _ = worker.communicate()
+                for key, value in json.loads(output.splitlines()[-1]).items():
+                    totals[key] += value
+            return totals
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_worker(start: float, until: float, write_ratio: float, seed: int) -> dict:
+    """
+    Runs a mixed read and write workload between the given times.
+
+    Parameters:
+    -----------
+    start : float
+        The UNIX time at which the workload starts.
+    until : float
+        The UNIX time at which the workload stops.
+    write_ratio : float
+        The share of operations that save a News row.
+    seed : int
+        The random seed of the worker.
+
+    Returns:
+    --------
+    counts : dict
+        The number of reads, writes, "database is locked" errors and other errors, and
+        the seconds each read took.
+    """
+    rng = random.Random(seed)
+    factory = RequestFactory()
+    index = IndexView.as_view()
+    detail = NewsDetailView.as_view()
+    ids = list(News.objects.values_list("pk", flat=True))
+    slugs = list(News.objects.values_list("slug", flat=True))
+    category_ids = list(Category.objects.values_list("pk", flat=True))
+    counts = {"reads": 0, "writes": 0, "locked": 0, "errors": 0, "latencies": []}
+    connection.close()
+
+    while time.time() < start:
+        time.sleep(0.01)
+    with override_settings(NEWS_PAGE_CACHE_TIMEOUT=0):
+        while time.time() < until:
+            try:
+                if rng.random() < write_ratio:
+                    with transaction.atomic():
+                        news = News.objects.get(pk=rng.choice(ids))
+                        news.text = f"Updated at {time.time()}"
+                        news.save()
+                        news.add_category.set(
+                            rng.sample(category_ids, min(2, len(category_ids)))
+                        )
+                    counts["writes"] += 1
+                else:
+                    started = time.perf_counter()
+                    if rng.random() < 0.5:
+                        response = index(factory.get(reverse("index")))
+                    else:
+                        slug = rng.choice(slugs)
+                        path = reverse("news_detail", args=[slug])
+                        response = detail(factory.get(path), slug=slug)
+                    response.render()
+                    counts["latencies"].append(time.perf_counter() - started)
+                    counts["reads"] += 1
+            except OperationalError as exc:
+                key = "locked" if "locked" in str(exc) else "errors"
+                counts[key] += 1
+    return counts
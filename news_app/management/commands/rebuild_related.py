@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from news_app.related import rebuild
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the related articles of every news article.
+
+    The corpus is scored in batches of ``--batch-size`` articles on ``--workers``
+    processes, replacing the whole related_news table in one transaction.
+    """
+
+    help = "Rebuilds the precomputed related articles of all news."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Number of worker processes."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Articles scored per batch."
+        )
+
+    def handle(self, *args, **options) -> None:
+        count = rebuild(options["workers"], options["batch_size"])
+        self.stdout.write(f"Rebuilt related articles of {count} news.")
@@ -0,0 +1,58 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from news_app.models import News
+from news_app.rendering import render_html
+
+
+class Command(BaseCommand):
+    """
+    Backfills the pre-rendered HTML of news articles.
+
+    Articles are loaded in chunks, rendered on ``--workers`` processes and written back
+    with ``bulk_update``, which skips ``News.save`` and its signals.
+    """
+
+    help = "Renders the sanitized HTML of news articles that have none yet."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Number of worker processes."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Articles written per batch."
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Re-render every news article."
+        )
+
+    def handle(self, *args, **options) -> None:
+        queryset = News.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(rendered_text="")
+        ids = list(queryset.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+
+        # Workers are forked so they inherit the configured Django settings.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            for start in range(0, len(ids), batch_size):
+                batch = list(
+                    News.objects.filter(pk__in=ids[start : start + batch_size]).only(
+                        "pk", "text"
+                    )
+                )
+                texts = [news.text for news in batch]
+                chunksize = max(1, len(batch) // options["workers"])
+                for news, html in zip(
+                    batch, executor.map(render_html, texts, chunksize=chunksize)
+                ):
+                    news.rendered_text = html
+                News.objects.bulk_update(batch, ["rendered_text"])
+        self.stdout.write(f"Rendered {len(ids)} news.")
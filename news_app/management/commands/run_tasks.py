@@ -0,0 +1,58 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from news_app.tasks import run_pending
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Runs the background task worker.
+
+    The worker claims batches of due tasks from the task table and runs them on a
+    thread pool, sleeping for ``--interval`` seconds whenever the queue is empty.
+    Database errors, like SQLite's "database is locked", are logged and retried after
+    the same pause rather than stopping the worker.
+    """
+
+    help = "Runs queued background tasks."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Number of worker threads."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=20, help="Tasks claimed per batch."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty."
+        )
+
+    def handle(self, *args, **options) -> None:
+        total = 0
+        while True:
+            try:
+                count = run_pending(options["batch_size"], options["workers"])
+            except DatabaseError:
+                logger.exception("Could not run the queued tasks, retrying")
+                connections.close_all()
+                time.sleep(options["interval"])
+                continue
+            total += count
+            if count:
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(f"Ran {total} tasks.")
@@ -0,0 +1,234 @@
+from collections.abc import Callable
+
+import os
+import sys
+import gc
+import json
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer,
+    WSGIRequestHandler,
+    WSGIServer,
+)
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+
+from news_app import counters
+from news_app.startup import warm_process
+
+
+logger = logging.getLogger(__name__)
+
+
+class PreforkWSGIServer(ThreadedWSGIServer):
+    """
+    A WSGI server whose listening socket is shared by forked worker processes.
+
+    Each worker handles its connections on threads, so slow or idle clients only hold
+    a thread rather than the whole worker. A thread only lives as long as its client
+    connection and closes its database connections with it, so ``CONN_MAX_AGE`` does
+    not keep them across clients.
+    """
+
+    # Connections wait in the kernel until one of the workers accepts them.
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address) -> None:
+        # Idle connections closed by the handler timeout are expected, not errors.
+        if isinstance(sys.exc_info()[1], TimeoutError):
+            return
+        super().handle_error(request, client_address)
+
+
+class TimeoutWSGIRequestHandler(WSGIRequestHandler):
+    """
+    A request handler dropping connections that send nothing for ``timeout`` seconds.
+    """
+
+    timeout = 30
+
+
+class Command(BaseCommand):
+    """
+    Serves the project with preforked worker processes.
+
+    The parent process imports the project, warms it with ``warm_process`` and opens the
+    listening socket, then forks ``--workers`` processes accepting connections on it.
+    The workers share the warmed memory copy-on-write, so none of them starts cold.
+    ``--task-workers`` more processes run the queued tasks like ``run_tasks``, so one
+    command runs the whole site. Workers that exit are replaced; SIGTERM or SIGINT stop
+    them all. Connections idle for ``--timeout`` seconds are closed.
+    """
+
+    help = "Serves the project with preforked, pre-warmed worker processes."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--bind", default="0.0.0.0:8000", help="Address to listen on, host:port."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--task-workers",
+            type=int,
+            default=1,
+            help="Number of processes running the queued tasks, 0 to run them apart.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=TimeoutWSGIRequestHandler.timeout,
+            help="Seconds a connection may stay idle before it is closed.",
+        )
+        parser.add_argument(
+            "--warm-only",
+            action="store_true",
+            help="Warm the process, print the timings as JSON and exit.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        timings = {}
+        application = get_wsgi_application()
+        if settings.DEBUG:
+            application = StaticFilesHandler(application)
+        timings["wsgi"] = time.perf_counter() - started
+        timings.update(warm_process())
+        if options["warm_only"]:
+            self.stdout.write(json.dumps(timings))
+            return
+
+        host, _, port = options["bind"].rpartition(":")
+        if not host or not port.isdigit():
+            raise CommandError(f"Invalid address {options['bind']!r}, use host:port.")
+        handler = type(
+            "WSGIRequestHandler",
+            (TimeoutWSGIRequestHandler,),
+            {"timeout": options["timeout"]},
+        )
+        server = PreforkWSGIServer(
+            (host.strip("[]"), int(port)), handler, ipv6=":" in host
+        )
+        server.set_app(application)
+        self.stdout.write(
+            f"Serving on http://{options['bind']}/ with {options['workers']} workers "
+            f"and {options['task_workers']} task workers, warmed in {time.perf_counter() - started:.2f}s."
+        )
+        self.stdout.flush()
+        # Objects created so far are never freed, so the collector leaves their pages
+        # alone and the workers keep sharing them.
+        gc.freeze()
+        self.supervise(server, options["workers"], options["task_workers"])
+
+    def supervise(self, server: WSGIServer, workers: int, task_workers: int) -> None:
+        """
+        Forks the workers, replaces those that exit and stops them on SIGTERM or SIGINT.
+
+        Parameters:
+        -----------
+        server : WSGIServer
+            The server whose socket the workers accept connections on.
+        workers : int
+            The number of worker processes serving requests.
+        task_workers : int
+            The number of worker processes running the queued tasks.
+        """
+        children = {}
+        stopping = False
+
+        def serve() -> None:
+            # Threads do not survive the fork, so each worker starts its own.
+            counters.start()
+            server.serve_forever()
+
+        def run_tasks() -> None:
+            server.socket.close()
+            call_command("run_tasks")
+
+        def stop(signum, frame) -> None:
+            nonlocal stopping
+            stopping = True
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for target in [serve] * workers + [run_tasks] * task_workers:
+            children[self.fork(target)] = (time.monotonic(), target)
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            forked_at, target = children.pop(pid, (None, None))
+            if stopping or target is None:
+                continue
+            logger.warning(
+                "Worker %s exited with status %s, starting a new one", pid, status
+            )
+            # Do not spin when workers die right after starting.
+            if time.monotonic() - forked_at < 1:
+                time.sleep(1)
+                if stopping:
+                    continue
+            children[self.fork(target)] = (time.monotonic(), target)
+        server.server_close()
+
+    def fork(self, target: Callable) -> int:
+        """
+        Forks a worker process running ``target`` until it receives SIGTERM.
+
+        Parameters:
+        -----------
+        target : Callable
+            The function the worker runs, serving requests or running tasks.
+
+        Returns:
+        --------
+        pid : int
+            The process id of the worker, in the parent.
+        """
+        # Signals stay blocked until the worker has replaced the handlers of the parent.
+        stop_signals = {signal.SIGTERM, signal.SIGINT}
+        signal.pthread_sigmask(signal.SIG_BLOCK, stop_signals)
+        pid = os.fork()
+        if pid:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, stop_signals)
+            return pid
+
+        def exit_worker(signum, frame) -> None:
+            sys.exit(0)
+
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, exit_worker)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, stop_signals)
+            target()
+        except SystemExit as exc:
+            code = exc.code or 0
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+            code = 1
+        finally:
+            # os._exit skips atexit handlers, so buffered reads are written here.
+            try:
+                counters.flush()
+            except Exception:
+                logger.exception("Could not write the buffered news reads")
+            connections.close_all()
+            os._exit(code)
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news_app.startup import import_report, parse_import_times
+
+
+class Command(BaseCommand):
+    """
+    Reports where the start-up time of a server process goes.
+
+    Runs ``serve --warm-only`` in a fresh interpreter with ``-X importtime`` and combines
+    the import times of each top-level package with the time spent warming. The
+    ``--json`` output is meant to be kept per release to track start-up time.
+    """
+
+    help = "Profiles the imports and warm-up of a server process."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--top", type=int, default=15, help="Number of packages listed."
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options) -> None:
+        command = [
+            sys.executable,
+            "-X",
+            "importtime",
+            os.path.join(settings.BASE_DIR, "manage.py"),
+            "serve",
+            "--warm-only",
+        ]
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        total = time.perf_counter() - started
+        if result.returncode:
+            raise CommandError(f"serve --warm-only failed:\n{result.stderr[-2000:]}")
+
+        report = {
+            "total": total,
+            **import_report(parse_import_times(result.stderr), options["top"]),
+            "warm": json.loads(result.stdout.splitlines()[-1]),
+        }
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{'Start-up of a server process':<32}{total:>8.3f}s")
+        self.stdout.write(
+            f"{'  imports (%d modules)' % report['modules']:<32}"
+            f"{report['imports']:>8.3f}s"
+        )
+        for name, seconds in report["warm"].items():
+            self.stdout.write(f"{'  warm ' + name:<32}{seconds:>8.3f}s")
+        self.stdout.write("Slowest packages to import:")
+        for name, seconds in report["packages"].items():
+            self.stdout.write(f"{'  ' + name:<32}{seconds:>8.3f}s")
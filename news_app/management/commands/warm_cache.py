@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from news_app.warming import warm_all
+
+
+class Command(BaseCommand):
+    """
+    Primes the page cache, e.g. after a deploy.
+
+    Renders the first ``--pages`` pages of the home and every category listing and,
+    unless ``--no-details`` is given, the detail page of every news article.
+    """
+
+    help = "Renders the home, category and news detail pages into the page cache."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=None,
+            help="Listing pages to warm, defaults to the NEWS_WARM_PAGES setting.",
+        )
+        parser.add_argument(
+            "--no-details",
+            action="store_true",
+            help="Skip the news detail pages.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        count = warm_all(options["pages"], details=not options["no_details"])
+        self.stdout.write(f"Warmed {count} pages.")
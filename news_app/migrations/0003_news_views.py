@@ -0,0 +1,61 @@
+# Generated by Django 4.1.7 on 2026-10-19 12:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0002_task"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="news",
+            name="views",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="views"
+            ),
+        ),
+        migrations.CreateModel(
+            name="NewsViews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="date")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="count")),
+                (
+                    "news",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_views",
+                        to="news_app.news",
+                        verbose_name="news",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "News views",
+                "verbose_name_plural": "News views",
+                "db_table": "news_views",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="newsviews",
+            index=models.Index(fields=["date"], name="news_views_date_dbf989_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="newsviews",
+            constraint=models.UniqueConstraint(
+                fields=("news", "date"), name="unique_news_day"
+            ),
+        ),
+    ]
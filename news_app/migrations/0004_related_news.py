@@ -0,0 +1,65 @@
+# Generated by Django 4.1.7 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0003_news_views"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedNews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="score")),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="rank")),
+                (
+                    "news",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="news_app.news",
+                        verbose_name="news",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="news_app.news",
+                        verbose_name="related news",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related news",
+                "verbose_name_plural": "Related news",
+                "db_table": "related_news",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="relatednews",
+            index=models.Index(
+                fields=["news", "rank"], name="related_new_news_id_70e040_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="relatednews",
+            constraint=models.UniqueConstraint(
+                fields=("news", "related"), name="unique_related_news"
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.7 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+def dedupe_slugs(apps, schema_editor) -> None:
+    """
+    Renames duplicate slugs by appending a counter, keeping the oldest row's slug.
+    """
+    for model_name in ("Category", "News"):
+        model = apps.get_model("news_app", model_name)
+        max_length = model._meta.get_field("slug").max_length
+        taken = set(model.objects.values_list("slug", flat=True))
+        seen = set()
+        for obj in model.objects.order_by("pk").only("slug"):
+            if obj.slug not in seen:
+                seen.add(obj.slug)
+                continue
+            counter = 2
+            while True:
+                suffix = f"-{counter}"
+                slug = obj.slug[: max_length - len(suffix)] + suffix
+                if slug not in taken:
+                    break
+                counter += 1
+            taken.add(slug)
+            seen.add(slug)
+            obj.slug = slug
+            obj.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0004_related_news"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="category",
+            name="slug",
+            field=models.SlugField(unique=True, verbose_name="slug"),
+        ),
+        migrations.AlterField(
+            model_name="news",
+            name="slug",
+            field=models.SlugField(unique=True, verbose_name="slug"),
+        ),
+    ]
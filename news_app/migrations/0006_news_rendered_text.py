@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2026-10-19 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0005_unique_slugs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="news",
+            name="rendered_text",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="rendered content"
+            ),
+        ),
+    ]
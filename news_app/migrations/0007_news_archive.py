@@ -0,0 +1,112 @@
+# Generated by Django 4.1.7 on 2026-10-19 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news_app", "0006_news_rendered_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivePeriod",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.CharField(max_length=7, verbose_name="period")),
+                ("count", models.PositiveIntegerField(verbose_name="count")),
+                ("oldest", models.DateTimeField(verbose_name="oldest")),
+                ("newest", models.DateTimeField(verbose_name="newest")),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="news_app.category",
+                        verbose_name="category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archive period",
+                "verbose_name_plural": "Archive periods",
+                "db_table": "news_archive_periods",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedNews",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "title",
+                    models.CharField(max_length=64, unique=True, verbose_name="title"),
+                ),
+                ("slug", models.SlugField(unique=True, verbose_name="slug")),
+                ("text", models.TextField(verbose_name="news content")),
+                (
+                    "rendered_text",
+                    models.TextField(blank=True, verbose_name="rendered content"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="created at")),
+                ("views", models.PositiveIntegerField(default=0, verbose_name="views")),
+                ("period", models.CharField(max_length=7, verbose_name="period")),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="archived at"),
+                ),
+                (
+                    "add_category",
+                    models.ManyToManyField(
+                        blank=True,
+                        db_table="news_archive_add_category",
+                        related_name="additional_category_archived_news",
+                        to="news_app.category",
+                        verbose_name="additional category",
+                    ),
+                ),
+                (
+                    "main_category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="main_category_archived_news",
+                        to="news_app.category",
+                        verbose_name="main category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived news",
+                "verbose_name_plural": "Archived news",
+                "db_table": "news_archive",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archiveperiod",
+            index=models.Index(
+                fields=["category", "period"], name="news_archiv_categor_60eae8_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivednews",
+            index=models.Index(
+                fields=["period", "created_at"], name="news_archiv_period_513e85_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivednews",
+            index=models.Index(
+                fields=["created_at"], name="news_archiv_created_6ae9e6_idx"
+            ),
+        ),
+    ]
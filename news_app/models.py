@@ -1,13 +1,25 @@
 from ckeditor.fields import RichTextField
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
+
+from .rendering import plain_text, render_html
 
 
 # Create your models here.
 
-__all__ = ("Category", "News")
+__all__ = (
+    "Category",
+    "News",
+    "NewsViews",
+    "RelatedNews",
+    "Task",
+    "ArchivedNews",
+    "ArchivePeriod",
+)
 
 
 class Category(models.Model):
@@ -30,7 +42,7 @@ class Category(models.Model):
     """
 
     name: str = models.CharField(max_length=64, unique=True, verbose_name="name")
-    slug: str = models.SlugField(verbose_name="slug")
+    slug: str = models.SlugField(unique=True, verbose_name="slug")
 
     def __str__(self) -> str:
         """
@@ -85,12 +97,16 @@ class News(models.Model):
         A unique slug to identify the news article.
     text : RichTextField
         The content of the news article.
+    rendered_text : str
+        The sanitized HTML of the content, rendered from ``text`` on save.
     main_category : ForeignKey
         A foreign key relationship to the main category of the news article.
     add_category : ManyToManyField
         A many-to-many relationship to additional categories for the news article.
     created_at : DateTimeField
         The datetime when the news article was created.
+    views : int
+        The number of times the news article was read.
 
     Methods:
     --------
@@ -98,11 +114,22 @@ class News(models.Model):
         Returns the title of the news article.
     get_absolute_url()
         Returns the absolute URL of the news article.
+    clean()
+        Checks that the slug and title are not taken by an archived news article.
+    save(*args, **kwargs)
+        Renders the content and saves the news article.
+    body_html
+        Returns the sanitized HTML of the content.
+    excerpt
+        Returns the plain text of the content.
     """
 
     title = models.CharField(max_length=64, unique=True, verbose_name="title")
-    slug = models.SlugField(verbose_name="slug")
+    slug = models.SlugField(unique=True, verbose_name="slug")
     text = RichTextField(verbose_name="news content")
+    rendered_text = models.TextField(
+        blank=True, editable=False, verbose_name="rendered content"
+    )
     main_category = models.ForeignKey(
         Category,
         on_delete=models.CASCADE,
@@ -116,6 +143,7 @@ class News(models.Model):
         blank=True,
     )
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    views = models.PositiveIntegerField(default=0, editable=False, verbose_name="views")
 
     def __str__(self) -> str:
         """
@@ -139,6 +167,77 @@ class News(models.Model):
         """
         return reverse("news_detail", args=[str(self.slug)])
 
+    def clean(self) -> None:
+        """
+        Checks that the slug and title are not taken by an archived news article.
+
+        Archived news keep their URLs, so a news article reusing one would hide the
+        archived article and could not be archived itself.
+
+        Raises:
+        -------
+        ValidationError
+            If an archived news article has the same slug or title.
+        """
+        super().clean()
+        errors = {}
+        taken = ArchivedNews.objects.filter(
+            models.Q(slug=self.slug) | models.Q(title=self.title)
+        ).values_list("slug", "title")
+        for slug, title in taken:
+            if slug == self.slug:
+                errors["slug"] = "An archived news article already has this slug."
+            if title == self.title:
+                errors["title"] = "An archived news article already has this title."
+        if errors:
+            raise ValidationError(errors)
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Renders the content into ``rendered_text`` and saves the news article.
+
+        Raises:
+        -------
+        ValidationError
+            If the slug or title is taken by an archived news article.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"slug", "title"} & set(update_fields):
+            self.clean()
+        self.rendered_text = render_html(self.text)
+        if update_fields is not None and "text" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "rendered_text"}
+        super().save(*args, **kwargs)
+
+    @property
+    def body_html(self) -> str:
+        """
+        Returns the sanitized HTML of the content.
+
+        Rows saved before ``rendered_text`` existed are rendered on the fly until the
+        ``render_news`` command has backfilled them.
+
+        Returns:
+        --------
+        html : str
+            The sanitized HTML.
+        """
+        if self.rendered_text or not self.text:
+            return self.rendered_text
+        return render_html(self.text)
+
+    @property
+    def excerpt(self) -> str:
+        """
+        Returns the plain text of the content, for listings that show a summary.
+
+        Returns:
+        --------
+        text : str
+            The text, safe to truncate and escaped by the template.
+        """
+        return plain_text(self.body_html)
+
     class Meta:
         """
         Meta options for the Category model.
@@ -158,6 +257,411 @@ class News(models.Model):
         db_table = "news"
 
 
+class NewsViews(models.Model):
+    """
+    A model class counting the reads of a news article on a single day.
+
+    Attributes:
+    -----------
+    news : ForeignKey
+        The news article that was read.
+    date : DateField
+        The day the reads happened on.
+    count : int
+        The number of reads on that day.
+    """
+
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        verbose_name="news",
+        related_name="daily_views",
+    )
+    date = models.DateField(verbose_name="date")
+    count = models.PositiveIntegerField(default=0, verbose_name="count")
+
+    class Meta:
+        """
+        Meta options for the NewsViews model.
+
+        Attributes:
+        -----------
+        verbose_name : str
+            A human-readable name for the model.
+        verbose_name_plural : str
+            The plural form of the verbose name.
+        db_table : str
+            The name of the database table to use for the model.
+        constraints : list
+            Allows only one row per news article and day.
+        indexes : list
+            The index used to aggregate the reads of recent days.
+        """
+
+        verbose_name = "News views"
+        verbose_name_plural = "News views"
+        db_table = "news_views"
+        constraints = [
+            models.UniqueConstraint(fields=["news", "date"], name="unique_news_day")
+        ]
+        indexes = [models.Index(fields=["date"])]
+
+
+class RelatedNews(models.Model):
+    """
+    A model class storing one entry of the precomputed related articles of a news article.
+
+    Attributes:
+    -----------
+    news : ForeignKey
+        The news article the entry belongs to.
+    related : ForeignKey
+        The related news article.
+    score : float
+        The relatedness score, higher is more related.
+    rank : int
+        The position of the entry in the related articles list, starting at 1.
+    """
+
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        verbose_name="news",
+        related_name="related_entries",
+    )
+    related = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        verbose_name="related news",
+        related_name="+",
+    )
+    score = models.FloatField(verbose_name="score")
+    rank = models.PositiveSmallIntegerField(verbose_name="rank")
+
+    class Meta:
+        """
+        Meta options for the RelatedNews model.
+
+        Attributes:
+        -----------
+        verbose_name : str
+            A human-readable name for the model.
+        verbose_name_plural : str
+            The plural form of the verbose name.
+        db_table : str
+            The name of the database table to use for the model.
+        constraints : list
+            Allows each related article only once per news article.
+        indexes : list
+            The index used to read the related articles of a news article in order.
+        """
+
+        verbose_name = "Related news"
+        verbose_name_plural = "Related news"
+        db_table = "related_news"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["news", "related"], name="unique_related_news"
+            )
+        ]
+        indexes = [models.Index(fields=["news", "rank"])]
+
+
+class Task(models.Model):
+    """
+    A model class representing a unit of background work queued for the task worker.
+
+    Attributes:
+    -----------
+    name : str
+        The registered name of the task function to run.
+    payload : str
+        The JSON encoded positional arguments passed to the task function.
+    dedupe_key : str
+        A hash of the name and payload, used to skip identical pending tasks.
+    status : str
+        The current state of the task, one of pending, running or failed.
+    attempts : int
+        The number of times the task has been tried.
+    max_attempts : int
+        The number of attempts after which the task is marked as failed.
+    run_after : DateTimeField
+        The earliest datetime at which the task may be picked up.
+    last_error : str
+        The error raised by the last failed attempt.
+    created_at : DateTimeField
+        The datetime when the task was queued.
+    updated_at : DateTimeField
+        The datetime when the task was last changed.
+
+    Methods:
+    --------
+    __str__()
+        Returns the name and status of the task.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "pending"),
+        (RUNNING, "running"),
+        (FAILED, "failed"),
+    )
+
+    name = models.CharField(max_length=128, verbose_name="name")
+    payload = models.TextField(default="[]", verbose_name="payload")
+    dedupe_key = models.CharField(max_length=64, verbose_name="dedupe key")
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=PENDING, verbose_name="status"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="attempts")
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3, verbose_name="max attempts"
+    )
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="run after")
+    last_error = models.TextField(blank=True, verbose_name="last error")
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, editable=False)
+
+    def __str__(self) -> str:
+        """
+        Returns the name and status of the task.
+
+        Returns:
+        --------
+        str:
+            The name of the task followed by its status.
+        """
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        """
+        Meta options for the Task model.
+
+        Attributes:
+        -----------
+        verbose_name : str
+            A human-readable name for the model.
+        verbose_name_plural : str
+            The plural form of the verbose name.
+        db_table : str
+            The name of the database table to use for the model.
+        indexes : list
+            The index used by the worker to find due tasks.
+        constraints : list
+            Allows only one pending task per dedupe key.
+        """
+
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        db_table = "tasks"
+        indexes = [models.Index(fields=["status", "run_after"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_task",
+            )
+        ]
+
+
+class ArchivedNews(models.Model):
+    """
+    A model class representing a news article moved out of the news table by the
+    ``archive_news`` command.
+
+    Rows keep the primary key, slug and content they had in the news table and are
+    partitioned by the month they were created in, so listings narrowed to a date range
+    only read the partitions that overlap it.
+
+    Attributes:
+    -----------
+    id : int
+        The primary key the news article had in the news table.
+    title : str
+        The title of the news article.
+    slug : SlugField
+        A unique slug to identify the news article.
+    text : str
+        The content of the news article.
+    rendered_text : str
+        The sanitized HTML of the content.
+    main_category : ForeignKey
+        A foreign key relationship to the main category of the news article.
+    add_category : ManyToManyField
+        A many-to-many relationship to additional categories for the news article.
+    created_at : DateTimeField
+        The datetime when the news article was created.
+    views : int
+        The number of times the news article was read before it was archived.
+    period : str
+        The partition of the news article, the month it was created in as "YYYY-MM".
+    archived_at : DateTimeField
+        The datetime when the news article was archived.
+
+    Methods:
+    --------
+    __str__()
+        Returns the title of the news article.
+    get_absolute_url()
+        Returns the absolute URL of the news article.
+    body_html
+        Returns the sanitized HTML of the content.
+    excerpt
+        Returns the plain text of the content.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=64, unique=True, verbose_name="title")
+    slug = models.SlugField(unique=True, verbose_name="slug")
+    text = models.TextField(verbose_name="news content")
+    rendered_text = models.TextField(blank=True, verbose_name="rendered content")
+    main_category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        verbose_name="main category",
+        related_name="main_category_archived_news",
+    )
+    add_category = models.ManyToManyField(
+        Category,
+        verbose_name="additional category",
+        related_name="additional_category_archived_news",
+        blank=True,
+        db_table="news_archive_add_category",
+    )
+    created_at = models.DateTimeField(verbose_name="created at")
+    views = models.PositiveIntegerField(default=0, verbose_name="views")
+    period = models.CharField(max_length=7, verbose_name="period")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="archived at")
+
+    def __str__(self) -> str:
+        """
+        Returns the title of the news article.
+
+        Returns:
+        --------
+        title : str
+            The title of the news article.
+        """
+        return self.title
+
+    def get_absolute_url(self) -> str:
+        """
+        Returns the absolute URL of the news article, the same as before it was archived.
+
+        Returns:
+        --------
+        url : str
+            The absolute URL of the news article.
+        """
+        return reverse("news_detail", args=[str(self.slug)])
+
+    @property
+    def body_html(self) -> str:
+        """
+        Returns the sanitized HTML of the content.
+
+        Returns:
+        --------
+        html : str
+            The sanitized HTML.
+        """
+        return self.rendered_text or render_html(self.text)
+
+    @property
+    def excerpt(self) -> str:
+        """
+        Returns the plain text of the content, for listings that show a summary.
+
+        Returns:
+        --------
+        text : str
+            The text, safe to truncate and escaped by the template.
+        """
+        return plain_text(self.body_html)
+
+    class Meta:
+        """
+        Meta options for the ArchivedNews model.
+
+        Attributes:
+        -----------
+        verbose_name : str
+            A human-readable name for the model.
+        verbose_name_plural : str
+            The plural form of the verbose name.
+        db_table : str
+            The name of the database table to use for the model.
+        indexes : list
+            The indexes used to list the news of a partition, or of all partitions, by date.
+        """
+
+        verbose_name = "Archived news"
+        verbose_name_plural = "Archived news"
+        db_table = "news_archive"
+        indexes = [
+            models.Index(fields=["period", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+
+class ArchivePeriod(models.Model):
+    """
+    A model class describing one partition of the news archive, for all news or for the
+    news of one category.
+
+    Listing views read these rows instead of the archive to learn whether it holds news
+    for the requested category and date range, and how many.
+
+    Attributes:
+    -----------
+    period : str
+        The partition, a month as "YYYY-MM".
+    category : ForeignKey
+        The category the row counts the news of, or None for all news.
+    count : int
+        The number of archived news in the partition.
+    oldest : DateTimeField
+        The creation time of the oldest news article in the partition.
+    newest : DateTimeField
+        The creation time of the newest news article in the partition.
+    """
+
+    period = models.CharField(max_length=7, verbose_name="period")
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        verbose_name="category",
+        related_name="+",
+    )
+    count = models.PositiveIntegerField(verbose_name="count")
+    oldest = models.DateTimeField(verbose_name="oldest")
+    newest = models.DateTimeField(verbose_name="newest")
+
+    class Meta:
+        """
+        Meta options for the ArchivePeriod model.
+
+        Attributes:
+        -----------
+        verbose_name : str
+            A human-readable name for the model.
+        verbose_name_plural : str
+            The plural form of the verbose name.
+        db_table : str
+            The name of the database table to use for the model.
+        indexes : list
+            The index used to find the partitions of a category.
+        """
+
+        verbose_name = "Archive period"
+        verbose_name_plural = "Archive periods"
+        db_table = "news_archive_periods"
+        indexes = [models.Index(fields=["category", "period"])]
+
+
 @receiver(post_migrate)
 def add_news(sender, **kwargs) -> None:
     """
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from collections import deque
+
+
+__all__ = ("Broker",)
+
+
+class Broker:
+    """
+    An in-process publish/subscribe channel fanning events out to many asyncio waiters.
+
+    Events are dicts with an increasing integer ``id``. They are kept in a bounded
+    history, so subscribers that fall behind or reconnect can catch up from the id they
+    saw last. All subscribers wait on one shared ``asyncio.Event`` that is replaced on
+    every publish, so idle subscribers cost a suspended coroutine each and publishing
+    costs the same however many of them there are.
+
+    Publishing is thread safe: events published from a sync thread, e.g. by a model
+    signal, are handed to the event loop the subscribers run on.
+
+    Attributes:
+    -----------
+    history : deque
+        The most recent events, oldest first.
+    last_id : int
+        The id of the most recent event.
+    loop : asyncio.AbstractEventLoop | None
+        The event loop of the subscribers, bound on the first subscription.
+
+    Methods:
+    --------
+    publish(event)
+        Publishes an event to the current and future subscribers.
+    wait(after, timeout)
+        Waits for events newer than the given id.
+    """
+
+    def __init__(self, history: int = 1000) -> None:
+        self.history: deque = deque(maxlen=history)
+        self.last_id: int = 0
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.changed: asyncio.Event | None = None
+        self.lock = threading.Lock()
+
+    def bind(self) -> bool:
+        """
+        Binds the broker to the running event loop.
+
+        Returns:
+        --------
+        bool:
+            True if the broker was bound by this call, False if it already was.
+        """
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            if self.loop is loop:
+                return False
+            self.loop = loop
+            self.changed = asyncio.Event()
+            return True
+
+    def publish(self, event: dict) -> None:
+        """
+        Publishes an event to the current and future subscribers.
+
+        Parameters:
+        -----------
+        event : dict
+            The event, with an integer ``id`` greater than those published before.
+        """
+        with self.lock:
+            loop = self.loop
+        if loop is None or loop.is_closed():
+            self.append(event)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self.append(event)
+            return
+        try:
+            loop.call_soon_threadsafe(self.append, event)
+        except RuntimeError:
+            # The loop was closed after the check above.
+            self.append(event)
+
+    def append(self, event: dict) -> None:
+        """
+        Stores an event and wakes the subscribers, on the loop thread once bound.
+        """
+        if event["id"] <= self.last_id:
+            return
+        self.history.append(event)
+        self.last_id = event["id"]
+        if self.changed is not None:
+            self.changed.set()
+            self.changed = asyncio.Event()
+
+    def since(self, after: int) -> list[dict]:
+        """
+        Returns the events of the history newer than the given id, oldest first.
+        """
+        events = []
+        for event in reversed(self.history):
+            if event["id"] <= after:
+                break
+            events.append(event)
+        events.reverse()
+        return events
+
+    async def wait(self, after: int, timeout: float | None = None) -> list[dict]:
+        """
+        Waits for events newer than the given id.
+
+        Parameters:
+        -----------
+        after : int
+            The id of the last event the subscriber has seen.
+        timeout : float | None
+            The number of seconds after which an empty list is returned.
+
+        Returns:
+        --------
+        events : list[dict]
+            The new events, oldest first, or an empty list on timeout.
+        """
+        self.bind()
+        events = self.since(after)
+        if events:
+            return events
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return self.since(after)
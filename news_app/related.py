@@ -0,0 +1,299 @@
+import math
+import multiprocessing
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q, QuerySet
+
+from .models import News, RelatedNews
+
+
+__all__ = ("Entry", "load_entries", "score", "top_related", "update_related", "rebuild")
+
+# The categories of a news article mapped to their weight and its age in days since the epoch.
+Entry = namedtuple("Entry", ("pk", "categories", "days"))
+
+# Weight of a category when it is the main category or an additional category.
+MAIN_WEIGHT = 2.0
+ADDITIONAL_WEIGHT = 1.0
+
+
+def load_entries(queryset: QuerySet) -> dict[int, Entry]:
+    """
+    Loads the scoring data of the news articles of a queryset.
+
+    Parameters:
+    -----------
+    queryset : QuerySet
+        A queryset of News objects.
+
+    Returns:
+    --------
+    entries : dict[int, Entry]
+        The entries keyed by news primary key.
+    """
+    categories = defaultdict(dict)
+    through = News.add_category.through.objects.filter(
+        news__in=queryset.values("pk")
+    ).values_list("news_id", "category_id")
+    for news_id, category_id in through:
+        categories[news_id][category_id] = ADDITIONAL_WEIGHT
+    entries = {}
+    for pk, main_category_id, created_at in queryset.values_list(
+        "pk", "main_category_id", "created_at"
+    ):
+        categories[pk][main_category_id] = MAIN_WEIGHT
+        entries[pk] = Entry(pk, categories[pk], created_at.timestamp() / 86400)
+    return entries
+
+
+def score(entry: Entry, candidate: Entry) -> float | None:
+    """
+    Scores how related a candidate article is to an article.
+
+    The score is the log of the category overlap plus an exponential recency bonus.
+    The bonus is computed from the age since a fixed epoch rather than from now, so
+    stored scores keep their order as time passes.
+
+    Parameters:
+    -----------
+    entry : Entry
+        The article whose related articles are scored.
+    candidate : Entry
+        The possibly related article.
+
+    Returns:
+    --------
+    score : float | None
+        The score, or None if the articles share no category.
+    """
+    overlap = sum(
+        min(weight, candidate.categories[category_id])
+        for category_id, weight in entry.categories.items()
+        if category_id in candidate.categories
+    )
+    if not overlap:
+        return None
+    half_life = settings.NEWS_RELATED_HALF_LIFE_DAYS
+    return math.log(overlap) + math.log(2) * candidate.days / half_life
+
+
+def top_related(entry: Entry, candidates, limit: int) -> list[tuple]:
+    """
+    Returns the best scored candidates of an article.
+
+    Parameters:
+    -----------
+    entry : Entry
+        The article whose related articles are computed.
+    candidates : Iterable[Entry]
+        The articles sharing at least one category with it.
+    limit : int
+        The maximum number of related articles.
+
+    Returns:
+    --------
+    related : list[tuple]
+        (score, pk) tuples ordered from the most to the least related.
+    """
+    scored = []
+    for candidate in candidates:
+        if candidate.pk == entry.pk:
+            continue
+        value = score(entry, candidate)
+        if value is not None:
+            scored.append((value, candidate.pk))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+
+def candidates_of(category_ids) -> QuerySet:
+    """
+    Returns the news articles having one of the given categories.
+    """
+    return News.objects.filter(
+        Q(main_category_id__in=category_ids) | Q(add_category__in=category_ids)
+    ).distinct()
+
+
+def save_related(related: dict[int, list]) -> None:
+    """
+    Replaces the stored related articles of the given news articles.
+
+    Parameters:
+    -----------
+    related : dict[int, list]
+        (score, pk) lists keyed by news primary key.
+    """
+    RelatedNews.objects.filter(news_id__in=list(related)).delete()
+    RelatedNews.objects.bulk_create(related_rows(related))
+
+
+def related_rows(related: dict[int, list]) -> list[RelatedNews]:
+    """
+    Returns the RelatedNews rows of (score, pk) lists keyed by news primary key.
+    """
+    return [
+        RelatedNews(news_id=news_id, related_id=pk, score=value, rank=rank)
+        for news_id, scored in related.items()
+        for rank, (value, pk) in enumerate(scored, start=1)
+    ]
+
+
+def update_related(news_id: int) -> None:
+    """
+    Updates the related articles after a news article or its categories changed.
+
+    The article's own list is recomputed. The article is merged into the lists of the
+    articles sharing a category with it, and lists it used to appear in are recomputed.
+
+    Parameters:
+    -----------
+    news_id : int
+        The primary key of the news article.
+    """
+    limit = settings.NEWS_RELATED_LIMIT
+    entry = load_entries(News.objects.filter(pk=news_id)).get(news_id)
+    if entry is None:
+        return
+    candidates = load_entries(candidates_of(list(entry.categories)))
+    stored = defaultdict(list)
+    for row in RelatedNews.objects.filter(
+        Q(news_id__in=list(candidates)) | Q(related_id=news_id)
+    ):
+        stored[row.news_id].append((row.score, row.related_id))
+
+    changed = {news_id: top_related(entry, candidates.values(), limit)}
+    recompute = {
+        pk
+        for pk, scored in stored.items()
+        if pk != news_id and any(related_id == news_id for _, related_id in scored)
+    }
+    for pk, candidate in candidates.items():
+        if pk == news_id or pk in recompute:
+            continue
+        value = score(candidate, entry)
+        scored = sorted(stored[pk], reverse=True)
+        if value is not None and (len(scored) < limit or value > scored[-1][0]):
+            changed[pk] = sorted(scored + [(value, news_id)], reverse=True)[:limit]
+    if recompute:
+        changed.update(
+            recompute_related(recompute, candidates, set(entry.categories), limit)
+        )
+    with transaction.atomic():
+        save_related(changed)
+
+
+def recompute_related(
+    ids, loaded: dict[int, Entry], complete: set, limit: int
+) -> dict[int, list]:
+    """
+    Recomputes the related articles of the given news articles from scratch.
+
+    The candidates of all of them are loaded in one go, reusing the entries already
+    loaded, rather than once per article.
+
+    Parameters:
+    -----------
+    ids : Iterable[int]
+        The primary keys of the news articles.
+    loaded : dict[int, Entry]
+        Entries already loaded.
+    complete : set
+        The categories all of whose news articles are in ``loaded``.
+    limit : int
+        The maximum number of related articles.
+
+    Returns:
+    --------
+    related : dict[int, list]
+        (score, pk) lists keyed by news primary key.
+    """
+    entries = load_entries(News.objects.filter(pk__in=list(ids)))
+    missing = set().union(*(entry.categories for entry in entries.values())) - complete
+    corpus = dict(loaded)
+    if missing:
+        corpus.update(load_entries(candidates_of(list(missing))))
+    by_category = defaultdict(set)
+    for candidate in corpus.values():
+        for category_id in candidate.categories:
+            by_category[category_id].add(candidate.pk)
+    related = {}
+    for pk, entry in entries.items():
+        candidate_ids = set().union(*(by_category[c] for c in entry.categories))
+        candidates = (corpus[candidate_id] for candidate_id in candidate_ids)
+        related[pk] = top_related(entry, candidates, limit)
+    return related
+
+
+# Corpus shared with the worker processes of a rebuild.
+corpus: dict[int, Entry] = {}
+index: dict[int, set] = {}
+
+
+def rebuild(workers: int = 4, batch_size: int = 500) -> int:
+    """
+    Recomputes the related articles of every news article.
+
+    The corpus is loaded once and scored in batches on a process pool, then the
+    results are written in one transaction.
+
+    Parameters:
+    -----------
+    workers : int
+        The number of worker processes.
+    batch_size : int
+        The number of articles scored per batch.
+
+    Returns:
+    --------
+    count : int
+        The number of news articles processed.
+    """
+    entries = load_entries(News.objects.all())
+    by_category = defaultdict(set)
+    for entry in entries.values():
+        for category_id in entry.categories:
+            by_category[category_id].add(entry.pk)
+    ids = sorted(entries)
+    batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+    limit = settings.NEWS_RELATED_LIMIT
+
+    # Workers are forked so they inherit the configured Django settings.
+    connections.close_all()
+    related = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=init_worker,
+        initargs=(entries, dict(by_category)),
+    ) as executor:
+        for result in executor.map(score_batch, batches, [limit] * len(batches)):
+            related.update(result)
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        RelatedNews.objects.bulk_create(related_rows(related), batch_size=batch_size)
+    return len(related)
+
+
+def init_worker(entries: dict[int, Entry], by_category: dict[int, set]) -> None:
+    """
+    Stores the corpus in a rebuild worker process.
+    """
+    corpus.update(entries)
+    index.update(by_category)
+
+
+def score_batch(ids: list[int], limit: int) -> dict[int, list]:
+    """
+    Computes the related articles of a batch of news articles in a worker process.
+    """
+    result = {}
+    for pk in ids:
+        entry = corpus[pk]
+        candidate_ids = set().union(*(index[c] for c in entry.categories))
+        candidates = (corpus[candidate_id] for candidate_id in candidate_ids)
+        result[pk] = top_related(entry, candidates, limit)
+    return result
@@ -0,0 +1,215 @@
+import re
+from html import escape, unescape
+from html.parser import HTMLParser
+
+from django.utils.html import strip_tags
+
+
+__all__ = ("render_html", "plain_text")
+
+# Tags kept in rendered articles, with the attributes kept on each of them.
+ALLOWED_TAGS = {
+    "a": {"href", "title"},
+    "b": set(),
+    "blockquote": set(),
+    "br": set(),
+    "caption": set(),
+    "code": set(),
+    "div": set(),
+    "em": set(),
+    "figcaption": set(),
+    "figure": set(),
+    "h1": set(),
+    "h2": set(),
+    "h3": set(),
+    "h4": set(),
+    "h5": set(),
+    "h6": set(),
+    "hr": set(),
+    "i": set(),
+    "img": {"src", "alt", "title", "width", "height"},
+    "li": set(),
+    "ol": set(),
+    "p": set(),
+    "pre": set(),
+    "s": set(),
+    "strong": set(),
+    "sub": set(),
+    "sup": set(),
+    "table": set(),
+    "tbody": set(),
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+    "thead": set(),
+    "tr": set(),
+    "u": set(),
+    "ul": set(),
+}
+# Tags dropped together with their content.
+DROPPED_TAGS = {"script", "style", "iframe", "object", "embed", "noscript", "template"}
+VOID_TAGS = {"br", "hr", "img"}
+# Block tags implicitly closing an open paragraph, as browsers do.
+PARAGRAPH_CLOSING_TAGS = {
+    "blockquote",
+    "div",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "ol",
+    "p",
+    "pre",
+    "table",
+    "ul",
+}
+URL_ATTRIBUTES = {"href", "src"}
+SAFE_URL = re.compile(r"^(https?:|mailto:|/|#|[^:/?#]*(?:[/?#]|$))", re.IGNORECASE)
+STYLE_SIZE = re.compile(r"(width|height)\s*:\s*(\d+)px", re.IGNORECASE)
+
+
+class ArticleRenderer(HTMLParser):
+    """
+    An HTML parser writing a sanitized copy of CKEditor article HTML.
+
+    Tags outside ``ALLOWED_TAGS`` are unwrapped, tags in ``DROPPED_TAGS`` are removed
+    with their content, and disallowed attributes, unsafe URLs, comments and empty
+    paragraphs are stripped. Images get lazy loading and the width and height CKEditor
+    stores in their style attribute, so the browser can reserve their space.
+
+    Attributes:
+    -----------
+    output : list
+        The rendered HTML fragments.
+    open_tags : list
+        The allowed tags that are currently open, with their output position.
+    dropping : int
+        The nesting depth inside dropped tags.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.output: list = []
+        self.open_tags: list = []
+        self.dropping: int = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in DROPPED_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in PARAGRAPH_CLOSING_TAGS:
+            self.handle_endtag("p")
+        attributes = self.clean_attributes(tag, dict(attrs))
+        rendered = "".join(f' {name}="{escape(value)}"' for name, value in attributes)
+        if tag not in VOID_TAGS:
+            self.open_tags.append((tag, len(self.output)))
+        self.output.append(f"<{tag}{rendered}>")
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        if tag in DROPPED_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in DROPPED_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in ALLOWED_TAGS or tag in VOID_TAGS:
+            return
+        if tag not in (open_tag for open_tag, _ in self.open_tags):
+            return
+        while self.open_tags:
+            open_tag, position = self.open_tags.pop()
+            if open_tag == "p" and self.is_empty(position):
+                del self.output[position:]
+            else:
+                self.output.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    def clean_attributes(self, tag: str, attrs: dict) -> list:
+        """
+        Returns the allowed attributes of a tag, with image loading hints added.
+        """
+        attributes = []
+        for name in sorted(ALLOWED_TAGS[tag]):
+            value = attrs.get(name)
+            if value is None:
+                continue
+            if name in URL_ATTRIBUTES and not SAFE_URL.match(value.strip()):
+                continue
+            attributes.append((name, value))
+        if tag == "img":
+            present = {name for name, _ in attributes}
+            for name, size in STYLE_SIZE.findall(attrs.get("style") or ""):
+                if name.lower() not in present:
+                    attributes.append((name.lower(), size))
+            attributes += [("loading", "lazy"), ("decoding", "async")]
+        return attributes
+
+    def is_empty(self, position: int) -> bool:
+        """
+        Returns whether the output after a position holds no text and no image.
+        """
+        content = "".join(self.output[position + 1 :])
+        text = re.sub(r"<(?!img)[^>]*>", "", content)
+        return not text.replace("\xa0", " ").strip()
+
+    def close(self) -> str:
+        """
+        Finishes parsing, closes the tags left open and returns the rendered HTML.
+        """
+        super().close()
+        while self.open_tags:
+            self.handle_endtag(self.open_tags[-1][0])
+        return "".join(self.output).strip()
+
+
+def render_html(text: str) -> str:
+    """
+    Sanitizes the CKEditor HTML of an article for rendering.
+
+    Parameters:
+    -----------
+    text : str
+        The HTML stored by the editor.
+
+    Returns:
+    --------
+    html : str
+        The sanitized HTML.
+    """
+    renderer = ArticleRenderer()
+    renderer.feed(text or "")
+    return renderer.close()
+
+
+def plain_text(html: str) -> str:
+    """
+    Returns the text of rendered HTML, without tags or character references.
+
+    The result is plain text, so templates escape it once and can truncate it without
+    cutting a character reference in half.
+
+    Parameters:
+    -----------
+    html : str
+        The sanitized HTML.
+
+    Returns:
+    --------
+    text : str
+        The text, with runs of whitespace collapsed.
+    """
+    return " ".join(unescape(strip_tags(html)).split())
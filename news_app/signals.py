@@ -0,0 +1,157 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .category_context_proc import clear_category_nav
+from .events import publish_news
+from .models import Category, News, RelatedNews
+from .slug_cache import category_slugs, news_slugs
+from .tasks import enqueue
+from .warming import evict_listings, evict_news
+
+
+@receiver(pre_save, sender=News)
+def news_saving(sender, instance: News, **kwargs) -> None:
+    """
+    Remembers the slug and main category a news article had before it is saved.
+    """
+    instance._previous = (
+        News.objects.filter(pk=instance.pk).values("slug", "main_category_id").first()
+        if instance.pk is not None
+        else None
+    )
+
+
+@receiver(post_save, sender=News)
+def news_saved(sender, instance: News, **kwargs) -> None:
+    """
+    Evicts the slug of a saved news article and queues its post-publish work once the
+    save is committed. New articles are also streamed to Server-Sent Events clients.
+
+    The first pages of the listings showing the article are evicted on commit, so
+    they do not wait for the task worker to show it. The news_changed task only sees
+    the current slug and main category, so the detail page under a changed slug is
+    evicted here and the listing of a previous main category re-rendered.
+    """
+    news_slugs.evict_pk(instance.pk)
+    previous = getattr(instance, "_previous", None) or {}
+    if previous.get("slug", instance.slug) != instance.slug:
+        evict_news(previous["slug"])
+    old_category_id = previous.get("main_category_id", instance.main_category_id)
+
+    def queue() -> None:
+        evict_listings(
+            {
+                instance.main_category_id,
+                old_category_id,
+                *instance.add_category.values_list("pk", flat=True),
+            }
+        )
+        if old_category_id != instance.main_category_id:
+            enqueue("category_changed", old_category_id)
+        enqueue("news_changed", instance.pk)
+
+    transaction.on_commit(queue)
+    if kwargs.get("created"):
+        transaction.on_commit(publish_news)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance: Category, **kwargs) -> None:
+    """
+    Evicts the slug of a saved category and queues its follow-up work once the save is
+    committed.
+
+    Every page shows the category navigation, so it is reloaded and all listings are
+    re-rendered as well.
+    """
+    category_slugs.evict_pk(instance.pk)
+    clear_category_nav()
+
+    def queue() -> None:
+        category_slugs.bump()
+        enqueue("category_changed", instance.pk)
+        enqueue("listings_changed")
+
+    transaction.on_commit(queue)
+
+
+@receiver(pre_delete, sender=News)
+def news_deleting(sender, instance: News, **kwargs) -> None:
+    """
+    Remembers the categories of a news article, and the news articles listing it as
+    related, before those rows are deleted with it.
+    """
+    instance._category_ids = {
+        instance.main_category_id,
+        *instance.add_category.values_list("pk", flat=True),
+    }
+    instance._related_of = set(
+        RelatedNews.objects.filter(related=instance).values_list("news_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=News)
+def news_deleted(sender, instance: News, **kwargs) -> None:
+    """
+    Evicts the slug, detail page and listings of a deleted news article and queues the
+    listings to be re-rendered.
+
+    The related articles of the news articles that listed it are recomputed, as their
+    lists lost an entry.
+    """
+    news_slugs.evict_pk(instance.pk)
+    evict_news(instance.slug)
+    category_ids = getattr(instance, "_category_ids", {instance.main_category_id})
+    related_of = getattr(instance, "_related_of", set()) - {instance.pk}
+
+    def queue() -> None:
+        evict_listings(category_ids)
+        for news_id in sorted(related_of):
+            enqueue("news_changed", news_id)
+        for category_id in sorted(category_ids):
+            enqueue("category_changed", category_id)
+
+    transaction.on_commit(queue)
+
+
+@receiver(m2m_changed, sender=News.add_category.through)
+def add_category_changed(
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    """
+    Evicts the listings of the categories whose news changed and queues work for them
+    and for the news articles whose additional categories changed.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        news_ids, category_ids = pk_set or set(), {instance.pk}
+    else:
+        news_ids, category_ids = {instance.pk}, pk_set or set()
+
+    def queue() -> None:
+        evict_listings(category_ids)
+        for news_id in sorted(news_ids):
+            enqueue("news_changed", news_id)
+        for category_id in sorted(category_ids):
+            enqueue("category_changed", category_id)
+
+    transaction.on_commit(queue)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance: Category, **kwargs) -> None:
+    """
+    Evicts the slug of a deleted category from the slug cache and the navigation, and
+    from the slug caches of other processes once the delete is committed.
+    """
+    category_slugs.evict_pk(instance.pk)
+    clear_category_nav()
+    transaction.on_commit(category_slugs.bump)
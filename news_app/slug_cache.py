@@ -0,0 +1,151 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+from .models import Category, News
+
+
+__all__ = ("SlugCache", "news_slugs", "category_slugs")
+
+
+class SlugCache:
+    """
+    A bounded, thread safe LRU cache mapping the slugs of a model to primary keys.
+
+    Misses are resolved with one query and stored; once full, the least recently used
+    slug is dropped. Entries are evicted by signal handlers when a row is saved or
+    deleted in this process. Other processes are not notified: either callers verify
+    the slug of the row they load and call ``evict`` when it no longer matches, or,
+    with a ``version_key``, the signal handlers ``bump`` a version number in the shared
+    cache and every process drops its slugs when it sees the version change.
+
+    Attributes:
+    -----------
+    model : Model
+        The model whose slugs are cached.
+    maxsize : int | None
+        The maximum number of slugs, defaults to the ``NEWS_SLUG_CACHE_SIZE`` setting.
+    version_key : str | None
+        The shared cache key of the version number, or None to verify slugs instead.
+
+    Methods:
+    --------
+    get(slug)
+        Returns the primary key of the row with the given slug, or None.
+    evict(slug)
+        Removes a slug from the cache.
+    evict_pk(pk)
+        Removes the slug cached for a primary key.
+    clear()
+        Removes every slug from the cache.
+    bump()
+        Makes every process drop its slugs, once a row changed.
+    """
+
+    def __init__(
+        self, model: Model, maxsize: int | None = None, version_key: str | None = None
+    ) -> None:
+        self.model = model
+        self.maxsize = maxsize
+        self.version_key = version_key
+        self.version = None
+        self.pks: OrderedDict = OrderedDict()
+        self.slugs: dict = {}
+        self.lock = threading.Lock()
+
+    def get(self, slug: str) -> int | None:
+        """
+        Returns the primary key of the row with the given slug, or None.
+
+        Parameters:
+        -----------
+        slug : str
+            The slug to resolve.
+
+        Returns:
+        --------
+        pk : int | None
+            The primary key, or None if no row has the slug.
+        """
+        if self.version_key is not None:
+            version = cache.get(self.version_key)
+            with self.lock:
+                if version != self.version:
+                    self.pks.clear()
+                    self.slugs.clear()
+                    self.version = version
+        with self.lock:
+            pk = self.pks.get(slug)
+            if pk is not None:
+                self.pks.move_to_end(slug)
+                return pk
+        pk = self.model.objects.filter(slug=slug).values_list("pk", flat=True).first()
+        if pk is not None:
+            self.put(slug, pk)
+        return pk
+
+    def put(self, slug: str, pk: int) -> None:
+        """
+        Stores a slug, dropping the least recently used one when the cache is full.
+        """
+        maxsize = self.maxsize or settings.NEWS_SLUG_CACHE_SIZE
+        with self.lock:
+            self.pks[slug] = pk
+            self.pks.move_to_end(slug)
+            self.slugs[pk] = slug
+            while len(self.pks) > maxsize:
+                _, dropped = self.pks.popitem(last=False)
+                self.slugs.pop(dropped, None)
+
+    def evict(self, slug: str) -> None:
+        """
+        Removes a slug from the cache.
+
+        Parameters:
+        -----------
+        slug : str
+            The slug to remove.
+        """
+        with self.lock:
+            pk = self.pks.pop(slug, None)
+            if pk is not None and self.slugs.get(pk) == slug:
+                del self.slugs[pk]
+
+    def evict_pk(self, pk: int) -> None:
+        """
+        Removes the slug cached for a primary key.
+
+        Parameters:
+        -----------
+        pk : int
+            The primary key of a saved or deleted row.
+        """
+        with self.lock:
+            slug = self.slugs.pop(pk, None)
+            if slug is not None:
+                self.pks.pop(slug, None)
+
+    def clear(self) -> None:
+        """
+        Removes every slug from the cache.
+        """
+        with self.lock:
+            self.pks.clear()
+            self.slugs.clear()
+
+    def bump(self) -> None:
+        """
+        Changes the shared version number, so every process drops its slugs on its next
+        lookup. Meant to run once the change of a row is committed.
+        """
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+
+
+news_slugs = SlugCache(News)
+category_slugs = SlugCache(Category, version_key="slug_cache:categories:version")
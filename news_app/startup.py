@@ -0,0 +1,184 @@
+import os
+import logging
+import re
+import time
+from collections import defaultdict
+
+from django.db import connections
+from django.http import Http404
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.urls import URLResolver, get_resolver, resolve
+
+from .category_context_proc import category_nav
+from .models import Category, News
+
+
+__all__ = ("warm_process", "parse_import_times", "import_report")
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def warm_urls() -> int:
+    """
+    Compiles the patterns of every URL and fills the reverse lookup tables.
+
+    Returns:
+    --------
+    count : int
+        The number of compiled URL patterns.
+    """
+    count = 0
+    resolvers = [get_resolver()]
+    while resolvers:
+        resolver = resolvers.pop()
+        # Both properties are computed on first access and cached on the object.
+        resolver.reverse_dict
+        for pattern in resolver.url_patterns:
+            pattern.pattern.regex
+            count += 1
+            if isinstance(pattern, URLResolver):
+                resolvers.append(pattern)
+    return count
+
+
+def warm_templates() -> int:
+    """
+    Compiles the project templates into the cached template loader.
+
+    Returns:
+    --------
+    count : int
+        The number of compiled templates.
+    """
+    count = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.engine.dirs:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.endswith(".html"):
+                        path = os.path.join(root, name)
+                        engine.get_template(os.path.relpath(path, directory))
+                        count += 1
+    return count
+
+
+def warm_pages() -> int:
+    """
+    Renders the home page, a category page and a news detail page once.
+
+    Returns:
+    --------
+    count : int
+        The number of rendered pages.
+    """
+    paths = ["/"]
+    category = Category.objects.first()
+    if category is not None:
+        paths.append(category.get_absolute_url())
+    news = News.objects.order_by("-created_at").first()
+    if news is not None:
+        paths.append(news.get_absolute_url())
+
+    factory = RequestFactory()
+    count = 0
+    for path in paths:
+        request = factory.get(path)
+        # Rendered like a cache warming request, so the read is not counted.
+        request.refresh_page_cache = True
+        match = resolve(path)
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, "render"):
+                response.render()
+        except Http404:
+            continue
+        except Exception:
+            # A page that fails to render must not keep the server from starting.
+            logger.exception("Could not warm %s", path)
+            continue
+        count += 1
+    return count
+
+
+def warm_process() -> dict:
+    """
+    Loads everything a server process needs before it handles its first request.
+
+    Meant to run in the parent of preforked workers, which then share the warmed memory.
+    Database connections are closed afterwards, as they must not be shared.
+
+    Returns:
+    --------
+    timings : dict
+        The seconds spent warming the URLs, templates, category navigation and pages.
+    """
+    timings = {}
+    for name, step in (
+        ("urls", warm_urls),
+        ("templates", warm_templates),
+        ("category_nav", category_nav),
+        ("pages", warm_pages),
+    ):
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    connections.close_all()
+    return timings
+
+
+def parse_import_times(output: str) -> list[tuple]:
+    """
+    Parses the report written to stderr by ``python -X importtime``.
+
+    Parameters:
+    -----------
+    output : str
+        The stderr output of the interpreter.
+
+    Returns:
+    --------
+    imports : list[tuple]
+        (module, nesting level, self seconds, cumulative seconds) tuples.
+    """
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append(
+                (module, (len(indent) - 1) // 2, int(own) / 1e6, int(cumulative) / 1e6)
+            )
+    return imports
+
+
+def import_report(imports: list[tuple], top: int = 15) -> dict:
+    """
+    Summarizes parsed import times by top-level package.
+
+    Parameters:
+    -----------
+    imports : list[tuple]
+        The tuples returned by ``parse_import_times``.
+    top : int
+        The number of packages listed.
+
+    Returns:
+    --------
+    report : dict
+        The total import time and the packages that took longest to import.
+    """
+    packages = defaultdict(float)
+    for module, _, own, _ in imports:
+        packages[module.split(".")[0]] += own
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "imports": sum(own for _, _, own, _ in imports),
+        "modules": len(imports),
+        "packages": dict(slowest[:top]),
+    }
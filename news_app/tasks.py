@@ -0,0 +1,247 @@
+from collections.abc import Callable
+
+import datetime
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import related, warming
+from .category_context_proc import clear_category_nav
+from .models import Task
+
+
+__all__ = ("task", "enqueue", "claim_batch", "run_task", "run_pending")
+
+logger = logging.getLogger(__name__)
+
+# Registered task functions keyed by their task name.
+registry: dict[str, Callable] = {}
+
+
+def task(name: str, max_attempts: int = 3) -> Callable:
+    """
+    Registers a function as a background task under the given name.
+
+    Parameters:
+    -----------
+    name : str
+        The name used to enqueue the task.
+    max_attempts : int
+        The number of attempts before the task is marked as failed.
+
+    Returns:
+    --------
+    decorator : Callable
+        A decorator returning the function unchanged.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.task_name = name
+        func.max_attempts = max_attempts
+        registry[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name: str, *args) -> Task | None:
+    """
+    Queues a task unless an identical one is already pending.
+
+    When the ``NEWS_TASKS_EAGER`` setting is on, the task runs immediately instead.
+
+    Parameters:
+    -----------
+    name : str
+        The registered name of the task.
+    *args
+        JSON serializable positional arguments for the task function.
+
+    Returns:
+    --------
+    task : Task | None
+        The queued task, or None when it was deduplicated or run eagerly.
+    """
+    func = registry[name]
+    if getattr(settings, "NEWS_TASKS_EAGER", False):
+        func(*args)
+        return None
+
+    payload = json.dumps(list(args), sort_keys=True)
+    dedupe_key = hashlib.sha1(f"{name}:{payload}".encode()).hexdigest()
+    if Task.objects.filter(dedupe_key=dedupe_key, status=Task.PENDING).exists():
+        return None
+    try:
+        with transaction.atomic():
+            return Task.objects.create(
+                name=name,
+                payload=payload,
+                dedupe_key=dedupe_key,
+                max_attempts=func.max_attempts,
+            )
+    except IntegrityError:
+        # Another process queued the same task in the meantime.
+        return None
+
+
+def claim_batch(batch_size: int, reclaim_after: int = 600) -> list[Task]:
+    """
+    Marks up to ``batch_size`` due tasks as running and returns them.
+
+    Tasks left running for longer than ``reclaim_after`` seconds, e.g. by a worker
+    that was killed, are put back in the queue first.
+
+    Parameters:
+    -----------
+    batch_size : int
+        The maximum number of tasks to claim.
+    reclaim_after : int
+        The number of seconds after which a running task is considered abandoned.
+
+    Returns:
+    --------
+    tasks : list[Task]
+        The claimed tasks in the order they were queued.
+    """
+    now = timezone.now()
+    stale = now - datetime.timedelta(seconds=reclaim_after)
+    with transaction.atomic():
+        for stuck in Task.objects.filter(status=Task.RUNNING, updated_at__lt=stale):
+            _requeue(stuck, now)
+        ids = list(
+            Task.objects.filter(status=Task.PENDING, run_after__lte=now)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        Task.objects.filter(id__in=ids, status=Task.PENDING).update(
+            status=Task.RUNNING, updated_at=now
+        )
+    return list(Task.objects.filter(id__in=ids, status=Task.RUNNING).order_by("id"))
+
+
+def run_task(task: Task) -> bool:
+    """
+    Runs a claimed task, deleting it on success and scheduling a retry on failure.
+
+    Parameters:
+    -----------
+    task : Task
+        A task previously returned by ``claim_batch``.
+
+    Returns:
+    --------
+    bool:
+        True if the task succeeded, otherwise False.
+    """
+    try:
+        registry[task.name](*json.loads(task.payload))
+    except Exception as exc:
+        logger.exception("Task %s failed", task)
+        task.attempts += 1
+        task.last_error = repr(exc)
+        if task.attempts >= task.max_attempts:
+            task.status = Task.FAILED
+            task.save()
+        else:
+            delay = datetime.timedelta(seconds=2**task.attempts)
+            _requeue(task, timezone.now() + delay)
+        return False
+    else:
+        task.delete()
+        return True
+
+
+def run_pending(batch_size: int = 20, workers: int = 4) -> int:
+    """
+    Claims one batch of due tasks and runs it on a thread pool.
+
+    With a single worker the tasks run in the calling thread.
+
+    Parameters:
+    -----------
+    batch_size : int
+        The maximum number of tasks to run.
+    workers : int
+        The number of threads running tasks concurrently.
+
+    Returns:
+    --------
+    count : int
+        The number of tasks that were run.
+    """
+    tasks = claim_batch(batch_size)
+    if not tasks:
+        return 0
+    if workers <= 1:
+        for task in tasks:
+            run_task(task)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_run_in_thread, tasks))
+    return len(tasks)
+
+
+def _run_in_thread(task: Task) -> bool:
+    """
+    Runs a task on a pool thread, closing the thread's database connection afterwards.
+    """
+    try:
+        return run_task(task)
+    finally:
+        connection.close()
+
+
+def _requeue(task: Task, run_after: datetime.datetime) -> None:
+    """
+    Puts a task back in the queue, dropping it if an identical task is already pending.
+    """
+    if Task.objects.filter(dedupe_key=task.dedupe_key, status=Task.PENDING).exists():
+        task.delete()
+        return
+    task.status = Task.PENDING
+    task.run_after = run_after
+    task.save()
+
+
+@task("news_changed")
+def news_changed(news_id: int) -> None:
+    """
+    Runs the post-publish work for a created or edited news article.
+
+    Parameters:
+    -----------
+    news_id : int
+        The primary key of the news article.
+    """
+    related.update_related(news_id)
+    warming.warm_news(news_id)
+
+
+@task("category_changed")
+def category_changed(category_id: int) -> None:
+    """
+    Runs the follow-up work for a category whose name, slug or news list changed.
+
+    Parameters:
+    -----------
+    category_id : int
+        The primary key of the category.
+    """
+    warming.warm_category(category_id)
+
+
+@task("listings_changed")
+def listings_changed() -> None:
+    """
+    Re-renders the home and category listings, e.g. after the category navigation changed.
+
+    The category may have been saved by another process, so the navigation of this one
+    is reloaded first.
+    """
+    clear_category_nav()
+    warming.warm_all(details=False)
@@ -1,10 +1,30 @@
+import os
+import asyncio
 import datetime
+import gzip
+import json
+import tempfile
+from io import StringIO
 from random import randint
+from unittest import mock
 
-from django.test import Client, TestCase
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models import Q, QuerySet
+from django.test import Client, RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
-from .models import Category, News
+from news.staticfiles import compress_file, serve
+
+from . import archive, counters, events, related, startup, tasks, warming
+from .category_context_proc import category_nav, clear_category_nav
+from .models import ArchivedNews, Category, News, NewsViews, RelatedNews, Task
+from .rendering import render_html
+from .slug_cache import SlugCache, category_slugs, news_slugs
 from .views import IndexView
 
 
@@ -160,3 +180,864 @@ class CategoryViewTest(BaseSetup):
         self.assertEqual(response.status_code, 200)
         self.assertTrue("filtred_news" in response.context)
         self.assertTrue(len(response.context["filtred_news"]) == 0)
+
+
+class TaskQueueTest(TestCase):
+    """
+    A test class for testing the background task queue.
+    """
+
+    def setUp(self) -> None:
+        """
+        Registers a task that records its calls and fails for negative arguments.
+        """
+        Task.objects.all().delete()
+        self.calls = []
+
+        @tasks.task("test_task", max_attempts=2)
+        def test_task(value: int) -> None:
+            if value < 0:
+                raise ValueError(value)
+            self.calls.append(value)
+
+        self.addCleanup(tasks.registry.pop, "test_task")
+
+    def test_identical_pending_tasks_are_deduplicated(self) -> None:
+        """
+        Tests that a task is queued only once while an identical one is pending.
+        """
+        self.assertIsNotNone(tasks.enqueue("test_task", 1))
+        self.assertIsNone(tasks.enqueue("test_task", 1))
+        self.assertIsNotNone(tasks.enqueue("test_task", 2))
+        self.assertEqual(Task.objects.filter(name="test_task").count(), 2)
+
+    def test_worker_survives_database_errors(self) -> None:
+        """
+        Tests that the worker logs a locked database and runs the tasks on its next try.
+        """
+        tasks.enqueue("test_task", 1)
+        claim_batch = tasks.claim_batch
+        errors = [OperationalError("database is locked")]
+
+        def flaky_claim_batch(batch_size: int) -> list:
+            if errors:
+                raise errors.pop()
+            return claim_batch(batch_size)
+
+        with mock.patch.object(tasks, "claim_batch", flaky_claim_batch):
+            with self.assertLogs("news_app.management.commands.run_tasks", "ERROR"):
+                call_command("run_tasks", once=True, interval=0, stdout=StringIO())
+        self.assertEqual(self.calls, [1])
+
+    def test_run_pending_runs_and_deletes_tasks(self) -> None:
+        """
+        Tests that successful tasks are run in queue order and removed.
+        """
+        tasks.enqueue("test_task", 1)
+        tasks.enqueue("test_task", 2)
+        self.assertEqual(tasks.run_pending(workers=1), 2)
+        self.assertEqual(self.calls, [1, 2])
+        self.assertFalse(Task.objects.filter(name="test_task").exists())
+
+    def test_failing_task_is_retried_then_marked_failed(self) -> None:
+        """
+        Tests that a failing task is rescheduled until it runs out of attempts.
+        """
+        task = tasks.enqueue("test_task", -1)
+        with self.assertLogs("news_app.tasks", "ERROR"):
+            tasks.run_task(tasks.claim_batch(1)[0])
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.PENDING)
+        self.assertEqual(task.attempts, 1)
+        self.assertEqual(tasks.claim_batch(1), [])
+
+        Task.objects.filter(pk=task.pk).update(run_after=task.created_at)
+        with self.assertLogs("news_app.tasks", "ERROR"):
+            tasks.run_task(tasks.claim_batch(1)[0])
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.FAILED)
+        self.assertIn("ValueError", task.last_error)
+
+
+@override_settings(
+    NEWS_PAGE_CACHE_TIMEOUT=300,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class PageCacheTest(BaseSetup):
+    """
+    A test class for testing the page cache and the cache warmer.
+    """
+
+    def setUp(self) -> None:
+        """
+        Starts every test with an empty cache.
+        """
+        cache.clear()
+
+    def test_unfiltered_pages_are_served_from_cache(self) -> None:
+        """
+        Tests that a second request for a page is answered from the cache.
+        """
+        first = self.client.get(reverse("index") + "?page=2")
+        second = self.client.get(reverse("index") + "?page=2")
+        self.assertIsNotNone(first.context)
+        self.assertIsNone(second.context)
+        self.assertEqual(first.content, second.content)
+
+    def test_filtered_pages_are_not_cached(self) -> None:
+        """
+        Tests that pages filtered by date are always rendered.
+        """
+        url = reverse("index") + "?start_date=2020-01-01&end_date=2020-01-02"
+        self.client.get(url)
+        self.assertIsNotNone(self.client.get(url).context)
+
+    def test_warm_news_renders_affected_pages(self) -> None:
+        """
+        Tests that warming a news article caches the home, category and detail pages.
+        """
+        self.client.get(reverse("index"))
+        news = News.objects.create(
+            title="Breaking", slug="breaking", text="text", main_category_id=1
+        )
+        urls = warming.news_urls(news)
+        self.assertIn((reverse("index"), 1), urls)
+        self.assertIn((news.main_category.get_absolute_url(), 1), urls)
+        self.assertIn((news.get_absolute_url(), 1), urls)
+
+        self.assertEqual(warming.warm_news(news.pk), len(urls))
+        response = self.client.get(reverse("index"))
+        self.assertIsNone(response.context)
+        self.assertContains(response, "Breaking")
+
+    def test_published_news_evicts_listings(self) -> None:
+        """
+        Tests that a published article shows up before the task worker re-renders pages.
+        """
+        category = Category.objects.get(slug="Category-3")
+        urls = [reverse("index"), category.get_absolute_url()]
+        for url in urls:
+            self.client.get(url)
+            self.assertIsNone(self.client.get(url).context)
+        with self.captureOnCommitCallbacks(execute=True):
+            News.objects.create(
+                title="Breaking", slug="breaking", text="text", main_category=category
+            )
+        for url in urls:
+            self.assertContains(self.client.get(url), "Breaking")
+
+    def test_moved_news_clears_its_old_pages(self) -> None:
+        """
+        Tests that a changed slug and main category evict the old detail page and
+        queue the old category listing.
+        """
+        news = News.objects.get(slug="news0")
+        old_url = news.get_absolute_url()
+        self.client.get(old_url)
+        old_category_id = news.main_category_id
+        news.slug = "news0-moved"
+        news.main_category = Category.objects.exclude(pk=old_category_id).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            news.save()
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertTrue(
+            Task.objects.filter(
+                name="category_changed", payload=json.dumps([old_category_id])
+            ).exists()
+        )
+
+
+@override_settings(
+    NEWS_VIEW_FLUSH_INTERVAL=3600,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class ViewCounterTest(BaseSetup):
+    """
+    A test class for testing the buffered view counters and the most read lists.
+    """
+
+    def setUp(self) -> None:
+        """
+        Starts every test with an empty cache and an empty read buffer.
+        """
+        cache.clear()
+        counters.pending.clear()
+
+    def test_reads_are_buffered_until_flushed(self) -> None:
+        """
+        Tests that reads are only written to the database when the buffer is flushed.
+        """
+        for _ in range(3):
+            self.client.get(reverse("news_detail", args=["news1"]))
+        self.client.get(reverse("news_detail", args=["news2"]))
+        self.assertEqual(News.objects.get(slug="news1").views, 0)
+
+        self.assertEqual(counters.flush(), 4)
+        self.assertEqual(News.objects.get(slug="news1").views, 3)
+        self.assertEqual(News.objects.get(slug="news2").views, 1)
+        self.assertEqual(NewsViews.objects.get(news__slug="news1").count, 3)
+        self.assertEqual(counters.flush(), 0)
+
+    def test_most_read_skips_news_removed_meanwhile(self) -> None:
+        """
+        Tests that news deleted after their reads were aggregated are left out.
+        """
+        counters.record_view("news1")
+        counters.record_view("news2")
+        counters.flush()
+        news = News.objects.get(slug="news1")
+        in_bulk = QuerySet.in_bulk
+
+        def in_bulk_after_delete(queryset: QuerySet, ids: list) -> dict:
+            return in_bulk(queryset.exclude(pk=news.pk), ids)
+
+        with mock.patch.object(QuerySet, "in_bulk", in_bulk_after_delete):
+            counters.refresh_most_read()
+        titles = [entry["title"] for entry in counters.most_read("week")]
+        self.assertEqual(titles, ["news2"])
+
+    def test_only_found_pages_are_counted(self) -> None:
+        """
+        Tests that requests for unknown slugs are not buffered.
+        """
+        response = self.client.get(reverse("news_detail", args=["missing"]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("missing", counters.pending)
+
+    def test_failed_flush_keeps_the_reads(self) -> None:
+        """
+        Tests that reads are put back in the buffer when writing them fails.
+        """
+        counters.record_view("news1")
+        with mock.patch.object(
+            NewsViews.objects,
+            "bulk_create",
+            side_effect=OperationalError("database is locked"),
+        ):
+            with self.assertRaises(OperationalError):
+                counters.flush()
+        self.assertEqual(counters.pending["news1"], 1)
+        self.assertEqual(counters.flush(), 1)
+
+    @override_settings(NEWS_VIEW_FLUSH_INTERVAL=0)
+    def test_reads_are_not_flushed_by_requests(self) -> None:
+        """
+        Tests that a request never writes the buffer, which is the flush thread's job.
+        """
+        self.client.get(reverse("news_detail", args=["news1"]))
+        self.client.get(reverse("news_detail", args=["news1"]))
+        self.assertEqual(News.objects.get(slug="news1").views, 0)
+        self.assertEqual(counters.pending["news1"], 2)
+
+    def test_most_read_lists_are_ranked_per_category(self) -> None:
+        """
+        Tests that the most read lists are ordered by reads and split by category.
+        """
+        for _ in range(2):
+            counters.record_view("news1")
+        counters.record_view("news2")
+        counters.flush()
+
+        titles = [entry["title"] for entry in counters.most_read("week")]
+        self.assertEqual(titles, ["news1", "news2"])
+        category = News.objects.get(slug="news2").main_category
+        self.assertIn(
+            "news2", [e["title"] for e in counters.most_read("today", category.slug)]
+        )
+
+        response = self.client.get(reverse("index"))
+        self.assertEqual(response.context["most_read_week"][0]["title"], "news1")
+
+
+class RelatedNewsTest(TestCase):
+    """
+    A test class for testing the precomputed related articles.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Creates three categories and four news articles with known categories.
+        """
+        News.objects.all().delete()
+        sport, music, films = (
+            Category.objects.create(name=name, slug=name)
+            for name in ("sport", "music", "films")
+        )
+        cls.first = News.objects.create(
+            title="first", slug="first", text="text", main_category=sport
+        )
+        cls.second = News.objects.create(
+            title="second", slug="second", text="text", main_category=sport
+        )
+        cls.second.add_category.add(music)
+        cls.third = News.objects.create(
+            title="third", slug="third", text="text", main_category=films
+        )
+        cls.fourth = News.objects.create(
+            title="fourth", slug="fourth", text="text", main_category=music
+        )
+        cls.fourth.add_category.add(sport)
+        cls.films = films
+
+    def related_titles(self, news: News) -> list:
+        """
+        Returns the titles of the stored related articles of a news article in rank order.
+        """
+        return list(
+            RelatedNews.objects.filter(news=news)
+            .order_by("rank")
+            .values_list("related__title", flat=True)
+        )
+
+    def test_related_articles_share_a_category(self) -> None:
+        """
+        Tests that only articles sharing a category are related, best overlap first.
+        """
+        related.update_related(self.first.pk)
+        self.assertEqual(self.related_titles(self.first), ["second", "fourth"])
+        related.update_related(self.third.pk)
+        self.assertEqual(self.related_titles(self.third), [])
+
+    def test_changed_article_is_merged_into_other_lists(self) -> None:
+        """
+        Tests that an article gaining a category appears in the lists of that category.
+        """
+        related.update_related(self.first.pk)
+        self.third.add_category.add(self.first.main_category)
+        related.update_related(self.third.pk)
+        self.assertIn("third", self.related_titles(self.first))
+
+        self.third.add_category.clear()
+        related.update_related(self.third.pk)
+        self.assertNotIn("third", self.related_titles(self.first))
+
+    @override_settings(NEWS_RELATED_LIMIT=1)
+    def test_deleted_article_is_replaced_in_lists(self) -> None:
+        """
+        Tests that the lists a deleted article was in are refilled by the task worker.
+        """
+        related.update_related(self.first.pk)
+        self.assertEqual(self.related_titles(self.first), ["second"])
+        # Drops the tasks queued when the test database was seeded.
+        Task.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        for task in tasks.claim_batch(Task.objects.count()):
+            tasks.run_task(task)
+        self.assertEqual(self.related_titles(self.first), ["fourth"])
+
+    def test_rebuild_matches_incremental_updates(self) -> None:
+        """
+        Tests that a parallel rebuild stores the same lists as incremental updates.
+        """
+        for news in News.objects.all():
+            related.update_related(news.pk)
+        incremental = {
+            news.pk: self.related_titles(news) for news in News.objects.all()
+        }
+        RelatedNews.objects.all().delete()
+        self.assertEqual(related.rebuild(workers=2, batch_size=2), 4)
+        rebuilt = {news.pk: self.related_titles(news) for news in News.objects.all()}
+        self.assertEqual(rebuilt, incremental)
+
+    def test_detail_page_lists_related_articles(self) -> None:
+        """
+        Tests that the detail page renders the stored related articles.
+        """
+        related.update_related(self.first.pk)
+        response = self.client.get(self.first.get_absolute_url())
+        self.assertEqual(response.context["related_news"], [self.second, self.fourth])
+        counters.pending.clear()
+
+
+class SlugCacheTest(BaseSetup):
+    """
+    A test class for testing the slug to primary key cache.
+    """
+
+    def setUp(self) -> None:
+        """
+        Starts every test with an empty news slug cache.
+        """
+        news_slugs.clear()
+        counters.pending.clear()
+
+    def test_hits_do_not_query_the_database(self) -> None:
+        """
+        Tests that a cached slug resolves without a query.
+        """
+        pk = News.objects.get(slug="news1").pk
+        self.assertEqual(news_slugs.get("news1"), pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(news_slugs.get("news1"), pk)
+        self.assertIsNone(news_slugs.get("missing"))
+
+    def test_least_recently_used_slug_is_dropped(self) -> None:
+        """
+        Tests that the cache keeps at most maxsize slugs, dropping the oldest first.
+        """
+        slugs = SlugCache(News, maxsize=2)
+        slugs.get("news1")
+        slugs.get("news2")
+        slugs.get("news1")
+        slugs.get("news3")
+        self.assertEqual(list(slugs.pks), ["news1", "news3"])
+
+    def test_saving_evicts_the_slug(self) -> None:
+        """
+        Tests that a renamed news article is served under its new slug only.
+        """
+        self.client.get(reverse("news_detail", args=["news1"]))
+        news = News.objects.get(slug="news1")
+        news.slug = "renamed"
+        news.save()
+        self.assertNotIn("news1", news_slugs.pks)
+        response = self.client.get(reverse("news_detail", args=["news1"]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse("news_detail", args=["renamed"]))
+        self.assertEqual(response.context["news"], news)
+
+    def test_stale_slug_from_another_process_is_verified(self) -> None:
+        """
+        Tests that a slug changed without a signal in this process is not served.
+        """
+        news_slugs.get("news1")
+        News.objects.filter(slug="news1").update(slug="renamed")
+        response = self.client.get(reverse("news_detail", args=["news1"]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("news1", news_slugs.pks)
+
+    def test_cached_category_slug_needs_no_query(self) -> None:
+        """
+        Tests that a cached category slug is resolved without querying the database.
+        """
+        category_id = category_slugs.get("Category-1")
+        with self.assertNumQueries(0):
+            self.assertEqual(category_slugs.get("Category-1"), category_id)
+
+    def test_reused_category_slug_from_another_process_is_reloaded(self) -> None:
+        """
+        Tests that a category slug moved to another category by another process lists
+        that category's news once that process bumped the slug cache version.
+        """
+        url = reverse("category_detail", args=["Category-1"])
+        self.client.get(url)
+        Category.objects.filter(slug="Category-1").update(slug="moved")
+        Category.objects.filter(slug="Category-2").update(slug="Category-1")
+        category_slugs.bump()
+        category = Category.objects.get(slug="Category-1")
+        count = (
+            News.objects.filter(Q(main_category=category) | Q(add_category=category))
+            .distinct()
+            .count()
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.context["paginator"].count, count)
+        self.assertEqual(category_slugs.get("Category-1"), category.pk)
+
+
+class RenderingTest(TestCase):
+    """
+    A test class for testing the pre-rendered article HTML.
+    """
+
+    def test_scripts_and_unsafe_attributes_are_removed(self) -> None:
+        """
+        Tests that scripts, event handlers and javascript URLs are stripped.
+        """
+        html = render_html(
+            '<p onclick="steal()">Hi<script>steal()</script> '
+            '<a href="javascript:steal()">link</a> <a href="/news/a/">ok</a></p>'
+        )
+        self.assertEqual(html, '<p>Hi <a>link</a> <a href="/news/a/">ok</a></p>')
+
+    def test_images_get_loading_hints_and_size(self) -> None:
+        """
+        Tests that images are lazy loaded and sized from the editor's style attribute.
+        """
+        html = render_html(
+            '<img src="/media/a.png" alt="A" style="width: 300px; height:200px">'
+        )
+        self.assertEqual(
+            html,
+            '<img alt="A" src="/media/a.png" width="300" height="200" '
+            'loading="lazy" decoding="async">',
+        )
+
+    def test_editor_cruft_is_stripped(self) -> None:
+        """
+        Tests that empty paragraphs, comments and spans are removed and tags are closed.
+        """
+        html = render_html(
+            '<p>&nbsp;</p><!-- note --><p><span style="color:red">red</span><p><b>open'
+        )
+        self.assertEqual(html, "<p>red</p><p><b>open</b></p>")
+
+    def test_save_stores_rendered_text(self) -> None:
+        """
+        Tests that saving a news article stores its rendered HTML.
+        """
+        category = Category.objects.create(name="rendering", slug="rendering")
+        news = News.objects.create(
+            title="rendered",
+            slug="rendered",
+            text="<p>body<script>x()</script></p>",
+            main_category=category,
+        )
+        self.assertEqual(news.rendered_text, "<p>body</p>")
+        News.objects.filter(pk=news.pk).update(rendered_text="")
+        news.refresh_from_db()
+        self.assertEqual(news.body_html, "<p>body</p>")
+
+    def test_home_excerpt_is_escaped_once(self) -> None:
+        """
+        Tests that character references in the content are not escaped twice.
+        """
+        category = Category.objects.create(name="excerpt", slug="excerpt")
+        news = News.objects.create(
+            title="excerpt",
+            slug="excerpt",
+            text="<p>Tom &amp; Jerry &lt;3</p>",
+            main_category=category,
+        )
+        self.assertEqual(news.excerpt, "Tom & Jerry <3")
+        response = self.client.get(reverse("index"))
+        self.assertContains(response, "Tom &amp; Jerry &lt;3")
+
+
+class StaticFilesTest(TestCase):
+    """
+    A test class for testing the precompressed static files.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a static root holding a compressible stylesheet.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.path = os.path.join(self.root, "site.css")
+        with open(self.path, "w") as file:
+            file.write("body { color: black; }\n" * 100)
+        self.written = compress_file(self.path)
+
+    def get(self, accept_encoding: str):
+        """
+        Serves the stylesheet for a request with the given Accept-Encoding header.
+        """
+        request = RequestFactory().get(
+            "/static/site.css", HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        with override_settings(STATIC_ROOT=self.root):
+            return serve(request, "site.css")
+
+    def test_compress_file_writes_smaller_variants(self) -> None:
+        """
+        Tests that compressing writes a gzip variant holding the original content.
+        """
+        self.assertIn(self.path + ".gz", self.written)
+        with gzip.open(self.path + ".gz") as file, open(self.path, "rb") as original:
+            self.assertEqual(file.read(), original.read())
+
+    def test_serves_the_accepted_variant(self) -> None:
+        """
+        Tests that the best accepted encoding is served with the original content type.
+        """
+        response = self.get("gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        if self.path + ".br" in self.written:
+            self.assertEqual(self.get("gzip, br")["Content-Encoding"], "br")
+
+    def test_serves_the_original_when_encodings_are_refused(self) -> None:
+        """
+        Tests that the uncompressed file is served when no variant is acceptable.
+        """
+        response = self.get("gzip;q=0, identity")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(b"".join(response.streaming_content).count(b"body"), 100)
+
+
+class NewsEventsTest(BaseSetup):
+    """
+    A test class for testing the Server-Sent Events stream of published news.
+    """
+
+    def setUp(self) -> None:
+        """
+        Empties the broker, as primary keys are reused once earlier tests rolled back.
+        """
+        events.broker.history.clear()
+        events.broker.last_id = 0
+
+    def stream(
+        self, query: bytes = b"", headers: list = (), publish=None, count: int = 1
+    ) -> list[str]:
+        """
+        Opens the stream, optionally publishes a news article once it is connected, and
+        returns the data of the first ``count`` events.
+        """
+        bodies = []
+
+        async def run() -> None:
+            connected, done = asyncio.Event(), asyncio.Event()
+
+            async def receive() -> dict:
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message: dict) -> None:
+                connected.set()
+                bodies.append(message.get("body", b"").decode())
+                if sum("event: news" in body for body in bodies) >= count:
+                    done.set()
+
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": events.EVENTS_PATH,
+                "query_string": query,
+                "headers": list(headers),
+            }
+            app = asyncio.ensure_future(events.news_events(scope, receive, send))
+            await asyncio.wait_for(connected.wait(), 5)
+            if publish is not None:
+                await sync_to_async(publish)()
+            await asyncio.wait_for(app, 5)
+
+        async_to_sync(run)()
+        return [
+            json.loads(line[len("data: ") :])
+            for body in bodies
+            for line in body.splitlines()
+            if line.startswith("data: ")
+        ]
+
+    def create_news(self, title: str, category: Category) -> News:
+        """
+        Creates a news article and runs its commit callbacks.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            return News.objects.create(
+                title=title, slug=title, text="text", main_category=category
+            )
+
+    def test_streams_published_news_of_the_category(self) -> None:
+        """
+        Tests that news saved while connected are streamed, filtered by category.
+        """
+        first, second = Category.objects.all()[:2]
+
+        def publish() -> None:
+            self.create_news("other", second)
+            self.create_news("fresh", first)
+
+        data = self.stream(b"category=" + first.slug.encode(), publish=publish)
+        self.assertEqual([event["title"] for event in data], ["fresh"])
+        self.assertEqual(data[0]["url"], reverse("news_detail", args=["fresh"]))
+
+    def test_streams_news_committed_together(self) -> None:
+        """
+        Tests that each of several news committed in one transaction is streamed.
+        """
+        category = Category.objects.first()
+
+        def publish() -> None:
+            with self.captureOnCommitCallbacks(execute=True):
+                for title in ("first", "second"):
+                    News.objects.create(
+                        title=title, slug=title, text="text", main_category=category
+                    )
+
+        data = self.stream(publish=publish, count=2)
+        self.assertEqual([event["title"] for event in data], ["first", "second"])
+
+    def test_streams_news_of_other_processes_in_order(self) -> None:
+        """
+        Tests that news committed by another process before a local one are not skipped.
+        """
+        category = Category.objects.first()
+
+        def publish() -> None:
+            # Saved without running the commit callbacks, like another process would.
+            News.objects.create(
+                title="remote", slug="remote", text="text", main_category=category
+            )
+            self.create_news("local", category)
+
+        data = self.stream(publish=publish, count=2)
+        self.assertEqual([event["title"] for event in data], ["remote", "local"])
+
+    def test_resumes_after_last_event_id(self) -> None:
+        """
+        Tests that a reconnecting client first receives the news it missed.
+        """
+        last = News.objects.order_by("-pk")[2]
+        data = self.stream(headers=[(b"last-event-id", str(last.pk).encode())], count=2)
+        expected = News.objects.filter(pk__gt=last.pk).order_by("pk")
+        self.assertEqual(
+            [event["id"] for event in data], [news.pk for news in expected]
+        )
+
+
+class ArchiveTest(BaseSetup):
+    """
+    A test class for testing the news archive.
+    """
+
+    def setUp(self) -> None:
+        """
+        Backdates the news of one category by a year and archives them.
+
+        Categories are assigned at random, so one news article is moved into the
+        category to make sure it is not empty.
+        """
+        self.category = Category.objects.get(slug="Category-0")
+        News.objects.filter(slug="news0").update(main_category=self.category)
+        self.old_ids = set(
+            News.objects.filter(
+                Q(main_category=self.category) | Q(add_category=self.category)
+            ).values_list("pk", flat=True)
+        )
+        self.old_date = timezone.now() - datetime.timedelta(days=365)
+        News.objects.filter(pk__in=self.old_ids).update(created_at=self.old_date)
+        self.total = News.objects.count()
+        self.archived = archive.archive_news(
+            timezone.now() - datetime.timedelta(days=30), batch_size=3
+        )
+
+    def test_moves_old_news_into_partitions(self) -> None:
+        """
+        Tests that old news are moved and counted in the partition catalog.
+        """
+        self.assertEqual(self.archived, len(self.old_ids))
+        self.assertFalse(News.objects.filter(pk__in=self.old_ids).exists())
+        self.assertEqual(
+            set(ArchivedNews.objects.values_list("pk", flat=True)), self.old_ids
+        )
+        self.assertEqual(
+            archive.partitions(self.category.pk),
+            [(archive.period_of(self.old_date), len(self.old_ids))],
+        )
+
+    def test_listing_appends_archived_news(self) -> None:
+        """
+        Tests that the archive is only read for pages past the end of the news table.
+        """
+        response = self.client.get(reverse("index"))
+        paginator = response.context["paginator"]
+        self.assertEqual(paginator.count, self.total)
+        self.assertTrue(
+            all(isinstance(news, News) for news in response.context["all_news"])
+        )
+        response = self.client.get(reverse("index") + f"?page={paginator.num_pages}")
+        self.assertIsInstance(response.context["all_news"][-1], ArchivedNews)
+
+    def test_date_range_reads_archived_partitions(self) -> None:
+        """
+        Tests that a date range in the past lists the archived news of the category.
+        """
+        day = self.old_date.strftime("%Y-%m-%d")
+        next_day = (self.old_date + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+        response = self.client.get(
+            reverse("category_detail", args=[self.category.slug])
+            + f"?start_date={day}&end_date={next_day}"
+        )
+        self.assertEqual(response.context["paginator"].count, len(self.old_ids))
+
+    def test_detail_page_of_archived_news(self) -> None:
+        """
+        Tests that archived news keep their detail page.
+        """
+        news = ArchivedNews.objects.first()
+        response = self.client.get(news.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["news"], news)
+        self.assertEqual(response.context["related_news"], [])
+
+    def test_news_cannot_reuse_archived_slug(self) -> None:
+        """
+        Tests that a news article cannot take the slug or title of an archived one.
+        """
+        archived = ArchivedNews.objects.first()
+        news = News(
+            title=archived.title,
+            slug=archived.slug,
+            text="Reused",
+            main_category=self.category,
+        )
+        with self.assertRaises(ValidationError) as raised:
+            news.full_clean()
+        self.assertEqual(set(raised.exception.message_dict), {"slug", "title"})
+        with self.assertRaises(ValidationError):
+            news.save()
+
+    def test_archiving_renames_clashing_archived_news(self) -> None:
+        """
+        Tests that news saved with an archived slug before the check can be archived.
+        """
+        archived = ArchivedNews.objects.first()
+        news = News.objects.exclude(pk__in=self.old_ids).first()
+        News.objects.filter(pk=news.pk).update(
+            slug=archived.slug, title=archived.title, created_at=self.old_date
+        )
+        with self.assertLogs("news_app.archive", "WARNING") as logs:
+            self.assertEqual(
+                archive.archive_news(timezone.now() - datetime.timedelta(days=30)), 1
+            )
+        self.assertEqual(
+            logs.output,
+            [
+                f"WARNING:news_app.archive:Archived news {archived.pk} clashes with "
+                "news being archived, renaming it"
+            ],
+        )
+        self.assertEqual(ArchivedNews.objects.get(slug=archived.slug).pk, news.pk)
+        renamed = ArchivedNews.objects.get(pk=archived.pk)
+        self.assertEqual(renamed.slug, f"{archived.slug}-{archived.pk}")
+        self.assertEqual(renamed.title, f"{archived.title} ({archived.pk})")
+
+
+class StartupTest(BaseSetup):
+    """
+    A test class for testing the warm-up of server processes.
+    """
+
+    def test_warm_process_fills_the_category_nav(self) -> None:
+        """
+        Tests that warming loads the navigation, which pages then render without a query.
+        """
+        clear_category_nav()
+        timings = startup.warm_process()
+        self.assertEqual(set(timings), {"urls", "templates", "category_nav", "pages"})
+        with self.assertNumQueries(0):
+            categories = category_nav()
+        self.assertEqual(len(categories), Category.objects.count())
+
+    def test_saving_a_category_clears_the_nav(self) -> None:
+        """
+        Tests that a saved category shows up in the navigation of the next page.
+        """
+        category_nav()
+        Category.objects.create(name="Fresh", slug="fresh")
+        self.assertIn("fresh", [category.slug for category in category_nav()])
+
+    def test_parse_import_times(self) -> None:
+        """
+        Tests that the -X importtime report is summed by top-level package.
+        """
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       300 |        300 |     django.utils\n"
+            "import time:       200 |        500 |   django\n"
+            "import time:       100 |        100 | json\n"
+        )
+        imports = startup.parse_import_times(output)
+        self.assertEqual(imports[0], ("django.utils", 2, 0.0003, 0.0003))
+        report = startup.import_report(imports, top=1)
+        self.assertEqual(report["modules"], 3)
+        self.assertAlmostEqual(report["packages"]["django"], 0.0005)
+        self.assertEqual(list(report["packages"]), ["django"])
@@ -1,32 +1,121 @@
 import datetime
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Model, Q, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
 from django.utils import timezone
 from django.views.generic import DetailView, ListView
 
+from .archive import ArchiveChain, partitions
+from .counters import most_read, record_view
 from .models import *
+from .slug_cache import category_slugs, news_slugs
+from .warming import page_cache_key
 
 
 __all__ = ("IndexView", "CategoryView", "NewsDetailView")
 
 
-class BaseNewsView(ListView):
+class CachedPageMixin:
+    """
+    A mixin serving GET responses from the page cache and storing rendered pages in it.
+
+    Only unfiltered pages are cached, keyed by path and page number. Requests flagged
+    with ``refresh_page_cache`` skip the lookup and overwrite the cached page, which is
+    how the cache warmer re-renders pages ahead of traffic.
+
+    Methods:
+    --------
+    get(request, *args, **kwargs)
+        Returns the cached page if there is one, otherwise renders and caches it.
+    get_page_cache_key(request)
+        Returns the page cache key for the request, or None if it is not cacheable.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Returns the cached page if there is one, otherwise renders and caches it.
+
+        Parameters:
+        -----------
+        request : HttpRequest
+            The current request.
+
+        Returns:
+        --------
+        response : HttpResponse
+            The cached or freshly rendered response.
+        """
+        timeout = settings.NEWS_PAGE_CACHE_TIMEOUT
+        key = self.get_page_cache_key(request) if timeout else None
+        if key is None:
+            return super().get(request, *args, **kwargs)
+        if not getattr(request, "refresh_page_cache", False):
+            content = cache.get(key)
+            if content is not None:
+                return HttpResponse(content)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered.content, timeout)
+            )
+        return response
+
+    @staticmethod
+    def get_page_cache_key(request: HttpRequest) -> str | None:
+        """
+        Returns the page cache key for the request, or None if it is not cacheable.
+
+        Parameters:
+        -----------
+        request : HttpRequest
+            The current request.
+
+        Returns:
+        --------
+        key : str | None
+            The cache key, or None for filtered or unusual requests.
+        """
+        if request.method != "GET" or set(request.GET) - {"page"}:
+            return None
+        page = request.GET.get("page", "1")
+        if not page.isdigit():
+            return None
+        return page_cache_key(request.path, int(page))
+
+
+class BaseNewsView(CachedPageMixin, ListView):
     """
     A base view to display a list of news objects with pagination and filtering by date range.
+
+    The news table is paginated first. Archived news are appended only when the partition
+    catalog shows archived news for the category and requested date range, and are only
+    loaded for pages past the end of the news table.
+
     Attributes:
     -----------
     paginate_by : int
         The number of news objects to display per page.
+    archive_category_id : int | None
+        The category whose archived news are listed, None for all news.
 
     Methods:
     --------
     get_queryset()
         Returns the queryset of News objects filtered by date range.
+    get_archive_queryset()
+        Returns the queryset of archived news to list after the news table, or None.
+    paginate_queryset(queryset, page_size)
+        Appends the archived news the listing needs and paginates.
+    get_date_range()
+        Returns the requested date range, or None.
     filter_by_date(queryset)
         Filters the queryset of News objects by date range.
     """
 
     paginate_by: int = 10
+    archive_category_id: int | None = None
 
     def get_queryset(self) -> QuerySet:
         """
@@ -41,19 +130,55 @@ class BaseNewsView(ListView):
         queryset = self.filter_by_date(queryset)
         return queryset
 
-    def filter_by_date(self, queryset: QuerySet) -> QuerySet:
+    def get_archive_queryset(self) -> QuerySet | None:
         """
-        Filters the queryset of News objects by date range.
+        Returns the queryset of archived news to list after the news table, or None.
+
+        Returns:
+        --------
+        queryset : QuerySet | None
+            A queryset of ArchivedNews objects, newest first.
+        """
+        return ArchivedNews.objects.select_related("main_category").order_by(
+            "-created_at"
+        )
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """
+        Appends the archived news the listing needs and paginates.
 
         Parameters:
         -----------
         queryset : QuerySet
-            A queryset of News objects.
+            The queryset of News objects.
+        page_size : int
+            The number of news objects per page.
 
         Returns:
         --------
-        queryset : QuerySet
-            A queryset of News objects filtered by date range.
+        result : tuple
+            The paginator, page, page news and whether there are several pages.
+        """
+        archived = self.get_archive_queryset()
+        if archived is not None:
+            start, end = self.get_date_range() or (None, None)
+            found = partitions(self.archive_category_id, start, end)
+            if found and start is None:
+                count = sum(count for _, count in found)
+                queryset = ArchiveChain(queryset, archived, count)
+            elif found:
+                archived = archived.filter(period__in=[period for period, _ in found])
+                queryset = ArchiveChain(queryset, self.filter_by_date(archived))
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_date_range(self) -> tuple | None:
+        """
+        Returns the requested date range, or None.
+
+        Returns:
+        --------
+        date_range : tuple | None
+            The aware start and end datetimes, or None if no range was requested.
         """
         start_date = self.request.GET.get("start_date")
         end_date = self.request.GET.get("end_date")
@@ -64,7 +189,26 @@ class BaseNewsView(ListView):
             end_datetime = timezone.make_aware(
                 datetime.datetime.strptime(end_date, "%Y-%m-%d")
             )
-            queryset = queryset.filter(created_at__range=(start_datetime, end_datetime))
+            return start_datetime, end_datetime
+        return None
+
+    def filter_by_date(self, queryset: QuerySet) -> QuerySet:
+        """
+        Filters the queryset of News objects by date range.
+
+        Parameters:
+        -----------
+        queryset : QuerySet
+            A queryset of News or ArchivedNews objects.
+
+        Returns:
+        --------
+        queryset : QuerySet
+            A queryset of News objects filtered by date range.
+        """
+        date_range = self.get_date_range()
+        if date_range:
+            queryset = queryset.filter(created_at__range=date_range)
         return queryset
 
 
@@ -85,7 +229,8 @@ class IndexView(BaseNewsView):
 
     Methods:
     --------
-    None
+    get_context_data(**kwargs)
+        Adds the news most read today and this week to the context.
     """
 
     template_name: str = "home.html"
@@ -93,6 +238,20 @@ class IndexView(BaseNewsView):
     model: Model = News
     ordering: str = "-created_at"
 
+    def get_context_data(self, **kwargs) -> dict:
+        """
+        Adds the news most read today and this week to the context.
+
+        Returns:
+        --------
+        context : dict
+            The template context.
+        """
+        context = super().get_context_data(**kwargs)
+        context["most_read_today"] = most_read("today")
+        context["most_read_week"] = most_read("week")
+        return context
+
 
 class CategoryView(BaseNewsView):
     """
@@ -109,6 +268,12 @@ class CategoryView(BaseNewsView):
     --------
     get_queryset()
         Returns the queryset of News objects filtered by a specific category and date range.
+    get_category_id()
+        Returns the primary key of the requested category, or None.
+    get_archive_queryset()
+        Returns the queryset of archived news of the category, or None.
+    get_context_data(**kwargs)
+        Adds the news of the category most read today and this week to the context.
     """
 
     context_object_name: str = "filtred_news"
@@ -118,15 +283,21 @@ class CategoryView(BaseNewsView):
         """
         Returns the queryset of News objects filtered by a specific category and date range.
 
+        The category slug is resolved through the slug cache, so the news are filtered by
+        category id without joining the categories table.
+
         Returns:
         --------
         queryset : QuerySet
             A queryset of News objects filtered by a specific category and date range.
         """
+        category_id = self.get_category_id()
+        self.archive_category_id = category_id
+        if category_id is None:
+            return News.objects.none()
         queryset = (
             News.objects.filter(
-                Q(main_category__slug=self.kwargs["slug"])
-                | Q(add_category__slug=self.kwargs["slug"])
+                Q(main_category_id=category_id) | Q(add_category=category_id)
             )
             .order_by("-created_at")
             .distinct()
@@ -134,8 +305,55 @@ class CategoryView(BaseNewsView):
         queryset = self.filter_by_date(queryset)
         return queryset
 
+    def get_category_id(self) -> int | None:
+        """
+        Returns the primary key of the requested category, or None.
+
+        The slug cache drops its slugs when a category is saved or deleted by any
+        process, so a cached primary key is trusted without a query.
+
+        Returns:
+        --------
+        category_id : int | None
+            The primary key of the category, or None if no category has the slug.
+        """
+        return category_slugs.get(self.kwargs["slug"])
+
+    def get_archive_queryset(self) -> QuerySet | None:
+        """
+        Returns the queryset of archived news of the category, or None.
+
+        Returns:
+        --------
+        queryset : QuerySet | None
+            A queryset of ArchivedNews objects, or None if the category does not exist.
+        """
+        category_id = self.archive_category_id
+        if category_id is None:
+            return None
+        return (
+            super()
+            .get_archive_queryset()
+            .filter(Q(main_category_id=category_id) | Q(add_category=category_id))
+            .distinct()
+        )
+
+    def get_context_data(self, **kwargs) -> dict:
+        """
+        Adds the news of the category most read today and this week to the context.
+
+        Returns:
+        --------
+        context : dict
+            The template context.
+        """
+        context = super().get_context_data(**kwargs)
+        context["most_read_today"] = most_read("today", self.kwargs["slug"])
+        context["most_read_week"] = most_read("week", self.kwargs["slug"])
+        return context
 
-class NewsDetailView(DetailView):
+
+class NewsDetailView(CachedPageMixin, DetailView):
     """
     A view to display the details of a specific news object.
 
@@ -150,9 +368,96 @@ class NewsDetailView(DetailView):
 
     Methods:
     --------
-    None
+    get(request, *args, **kwargs)
+        Counts the read and returns the news detail page.
+    get_object(queryset=None)
+        Returns the news object of the requested slug, resolved through the slug cache.
+    get_context_data(**kwargs)
+        Adds the precomputed related articles to the context.
     """
 
     template_name: str = "news_detail.html"
     context_object_name: str = "news"
     model: Model = News
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Counts the read and returns the news detail page.
+
+        Only pages that were found are counted, cached ones included, so requests for
+        unknown slugs do not fill the buffer. The count is buffered in memory and
+        written in batches.
+
+        Parameters:
+        -----------
+        request : HttpRequest
+            The current request.
+
+        Returns:
+        --------
+        response : HttpResponse
+            The cached or freshly rendered response.
+        """
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200 and not getattr(
+            request, "refresh_page_cache", False
+        ):
+            record_view(self.kwargs["slug"])
+        return response
+
+    def get_object(self, queryset: QuerySet | None = None) -> News | ArchivedNews:
+        """
+        Returns the news object of the requested slug, resolved through the slug cache.
+
+        A cached primary key may be stale when the slug was changed in another process,
+        so the slug of the loaded object is checked and the lookup retried once. Slugs
+        missing from the news table are looked up in the archive.
+
+        Parameters:
+        -----------
+        queryset : QuerySet | None
+            The queryset to load the object from, defaults to all news.
+
+        Returns:
+        --------
+        news : News | ArchivedNews
+            The requested news object.
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+        slug = self.kwargs["slug"]
+        for _ in range(2):
+            pk = news_slugs.get(slug)
+            if pk is None:
+                break
+            news = queryset.filter(pk=pk).first()
+            if news is not None and news.slug == slug:
+                return news
+            news_slugs.evict(slug)
+        archived = ArchivedNews.objects.filter(slug=slug).first()
+        if archived is not None:
+            return archived
+        raise Http404(f"No news found with slug {slug!r}")
+
+    def get_context_data(self, **kwargs) -> dict:
+        """
+        Adds the precomputed related articles to the context.
+
+        Archived news have no related articles.
+
+        Returns:
+        --------
+        context : dict
+            The template context.
+        """
+        context = super().get_context_data(**kwargs)
+        if not isinstance(self.object, News):
+            context["related_news"] = []
+            return context
+        context["related_news"] = [
+            entry.related
+            for entry in RelatedNews.objects.filter(news=self.object)
+            .select_related("related")
+            .order_by("rank")
+        ]
+        return context
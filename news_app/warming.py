@@ -0,0 +1,263 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .models import Category, News
+
+
+__all__ = (
+    "page_cache_key",
+    "news_urls",
+    "category_urls",
+    "warm_urls",
+    "warm_news",
+    "warm_category",
+    "warm_all",
+    "evict_news",
+    "evict_listings",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def page_cache_key(path: str, page: int = 1) -> str:
+    """
+    Returns the cache key of a rendered page.
+
+    Parameters:
+    -----------
+    path : str
+        The URL path of the page.
+    page : int
+        The page number of a paginated listing.
+
+    Returns:
+    --------
+    key : str
+        The key the page is cached under.
+    """
+    return f"page:{path}:{page}"
+
+
+def listing_urls(path: str, count: int, pages: int | None = None) -> list[tuple]:
+    """
+    Returns the first pages of a paginated news listing.
+
+    Parameters:
+    -----------
+    path : str
+        The URL path of the listing.
+    count : int
+        The number of news articles in the listing.
+    pages : int | None
+        The maximum number of pages, defaults to the ``NEWS_WARM_PAGES`` setting.
+
+    Returns:
+    --------
+    urls : list[tuple]
+        A list of (path, page) tuples, always including the first page.
+    """
+    from .views import BaseNewsView
+
+    if pages is None:
+        pages = settings.NEWS_WARM_PAGES
+    last_page = max(1, -(-count // BaseNewsView.paginate_by))
+    return [(path, page) for page in range(1, min(pages, last_page) + 1)]
+
+
+def category_urls(category: Category, pages: int | None = None) -> list[tuple]:
+    """
+    Returns the first pages of a category listing.
+
+    Parameters:
+    -----------
+    category : Category
+        The category whose listing is warmed.
+    pages : int | None
+        The maximum number of pages, defaults to the ``NEWS_WARM_PAGES`` setting.
+
+    Returns:
+    --------
+    urls : list[tuple]
+        A list of (path, page) tuples.
+    """
+    count = (
+        News.objects.filter(Q(main_category=category) | Q(add_category=category))
+        .distinct()
+        .count()
+    )
+    return listing_urls(category.get_absolute_url(), count, pages)
+
+
+def news_urls(news: News, pages: int | None = None) -> list[tuple]:
+    """
+    Returns the pages whose content changes when a news article is published or edited.
+
+    These are the first pages of the home listing, the first pages of the listing of the
+    main category and of every additional category, and the article's detail page.
+
+    Parameters:
+    -----------
+    news : News
+        The published or edited news article.
+    pages : int | None
+        The maximum number of listing pages, defaults to the ``NEWS_WARM_PAGES`` setting.
+
+    Returns:
+    --------
+    urls : list[tuple]
+        A list of (path, page) tuples.
+    """
+    urls = listing_urls(reverse("index"), News.objects.count(), pages)
+    categories = {news.main_category, *news.add_category.all()}
+    for category in sorted(categories, key=lambda category: category.pk):
+        urls += category_urls(category, pages)
+    urls.append((news.get_absolute_url(), 1))
+    return urls
+
+
+def warm_urls(urls: list[tuple]) -> int:
+    """
+    Renders the given pages and stores them in the page cache.
+
+    Parameters:
+    -----------
+    urls : list[tuple]
+        A list of (path, page) tuples.
+
+    Returns:
+    --------
+    count : int
+        The number of pages that were cached.
+    """
+    if not settings.NEWS_PAGE_CACHE_TIMEOUT:
+        return 0
+    factory = RequestFactory()
+    count = 0
+    for path, page in urls:
+        request = factory.get(path, {"page": page} if page > 1 else {})
+        request.refresh_page_cache = True
+        match = resolve(path)
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+        except Http404:
+            logger.warning("Could not warm %s page %s: not found", path, page)
+            continue
+        if hasattr(response, "render"):
+            response.render()
+        if response.status_code == 200:
+            count += 1
+        else:
+            logger.warning("Could not warm %s page %s: %s", path, page, response)
+    return count
+
+
+def warm_news(news_id: int) -> int:
+    """
+    Re-renders the pages affected by a created or edited news article.
+
+    Parameters:
+    -----------
+    news_id : int
+        The primary key of the news article.
+
+    Returns:
+    --------
+    count : int
+        The number of pages that were cached.
+    """
+    news = News.objects.select_related("main_category").filter(pk=news_id).first()
+    if news is None:
+        return 0
+    return warm_urls(news_urls(news))
+
+
+def warm_category(category_id: int) -> int:
+    """
+    Re-renders the first pages of the home listing and of a category listing.
+
+    Parameters:
+    -----------
+    category_id : int
+        The primary key of the category.
+
+    Returns:
+    --------
+    count : int
+        The number of pages that were cached.
+    """
+    urls = listing_urls(reverse("index"), News.objects.count())
+    category = Category.objects.filter(pk=category_id).first()
+    if category is not None:
+        urls += category_urls(category)
+    return warm_urls(urls)
+
+
+def warm_all(pages: int | None = None, details: bool = True) -> int:
+    """
+    Re-renders the home and category listings and, optionally, every detail page.
+
+    Parameters:
+    -----------
+    pages : int | None
+        The maximum number of pages per listing, defaults to the ``NEWS_WARM_PAGES`` setting.
+    details : bool
+        Whether to warm the detail page of every news article as well.
+
+    Returns:
+    --------
+    count : int
+        The number of pages that were cached.
+    """
+    count = warm_urls(listing_urls(reverse("index"), News.objects.count(), pages))
+    for category in Category.objects.order_by("pk"):
+        count += warm_urls(category_urls(category, pages))
+    if details:
+        for news in News.objects.only("slug").iterator():
+            count += warm_urls([(news.get_absolute_url(), 1)])
+    return count
+
+
+def evict_news(slug: str) -> None:
+    """
+    Removes the cached detail page of a news article.
+
+    Parameters:
+    -----------
+    slug : str
+        The slug of the news article.
+    """
+    cache.delete(page_cache_key(reverse("news_detail", args=[slug])))
+
+
+def evict_listings(category_ids) -> None:
+    """
+    Removes the cached first pages of the home listing and of the given categories.
+
+    The task worker re-renders them, but until it does they are rendered on demand
+    rather than served stale for up to ``NEWS_PAGE_CACHE_TIMEOUT`` seconds.
+
+    Parameters:
+    -----------
+    category_ids : Iterable[int]
+        The primary keys of the categories whose listings changed.
+    """
+    if not settings.NEWS_PAGE_CACHE_TIMEOUT:
+        return
+    paths = [reverse("index")]
+    for slug in Category.objects.filter(pk__in=list(category_ids)).values_list(
+        "slug", flat=True
+    ):
+        paths.append(reverse("category_detail", args=[slug]))
+    cache.delete_many(
+        [
+            page_cache_key(path, page)
+            for path in paths
+            for page in range(1, settings.NEWS_WARM_PAGES + 1)
+        ]
+    )